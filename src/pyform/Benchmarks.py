@@ -0,0 +1,533 @@
+"""
+Benchmarks for building forms, moving values in and out of them and laying
+them out, at sizes well beyond the demos.
+
+Forms are generated from Specs: 10 to 5,000 fields cycling through the
+control types, deeply nested containers and large grids.  The controls
+with optimizations of their own (virtual grids and lists, lazy trees and
+notebooks, check trees, indexed combo boxes) are also run on their own with
+1,000 and 100,000 rows or items.  Each benchmark is timed a few times and
+the median kept.  Results can be saved as a JSON
+baseline and later runs compared against it, listing anything that got
+slower than the tolerance allows.
+
+Needs a display, run it under Xvfb on a headless machine:
+
+    xvfb-run python -m pyform.Benchmarks --save baseline.json
+    xvfb-run python -m pyform.Benchmarks --baseline baseline.json
+
+The run also fails, exiting with 1, when importing Form loads any of the wx
+submodules only ExtendedControls needs.  To run just that check:
+
+    xvfb-run python -m pyform.Benchmarks --only import
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from functools import partial
+
+import wx
+
+from .Controls import (
+    Button,
+    CheckBox,
+    CheckListBox,
+    CheckTreeCtrl,
+    ColorPicker,
+    ComboBox,
+    DatePickerCtrl,
+    FileBrowser,
+    FloatSpin,
+    FolderBrowser,
+    Grid,
+    IpAddrCtrl,
+    ListBox,
+    ListCtrl,
+    Notebook,
+    NumCtrl,
+    PassCtrl,
+    RadioButton,
+    Slider,
+    SpinCtrl,
+    StaticLine,
+    StaticText,
+    TextCtrl,
+    TextFlow,
+    TreeCtrl,
+)
+from .Form import Form, FormDialog
+from .Layout import layout
+from .util.FlowSizer import FlowSizer
+
+SIZES = (10, 100, 1000, 5000)
+
+# The wx submodules only the controls in ExtendedControls need, importing
+# Form alone shouldn't load any of them.
+HEAVY_MODULES = (
+    "wx.adv",
+    "wx.aui",
+    "wx.grid",
+    "wx.lib.agw.customtreectrl",
+    "wx.lib.agw.floatspin",
+    "wx.lib.agw.hyperlink",
+    "wx.lib.combotreebox",
+    "wx.lib.masked",
+    "wx.py.crust",
+)
+CHOICES = [f"Option {i}" for i in range(20)]
+COLUMNS = ("Id", "Name", "Amount")
+
+
+def tableRows(count, columns=COLUMNS):
+    """
+    `count` rows of generated data for grids and lists.
+    """
+    return [(i, f"Name {i}", i * 1.5)[: len(columns)] for i in range(count)]
+
+
+def treeLoader(path, width=20, depth=3):
+    """
+    A lazy TreeCtrl loader, `width` children per item down to `depth`.
+    """
+    return [(f"Item {i}", len(path) + 1 < depth) for i in range(width)]
+
+
+def treeOptions(parents, children):
+    return [
+        (f"Group {p}", [f"Entry {p}.{c}" for c in range(children)])
+        for p in range(parents)
+    ]
+
+
+def notebookPages(tabs, fields):
+    return OrderedDict(
+        (
+            f"Tab {tab}",
+            [TextCtrl.spec(name=f"Tab{tab}F{i}") for i in range(fields)],
+        )
+        for tab in range(tabs)
+    )
+
+
+# The control types synthetic forms cycle through: the control, the options
+# it's declared with, a value to write to it (None for fields that aren't
+# written) and the options set on it (None for fields without options).
+FIELD_TYPES = (
+    (TextCtrl, {}, "text", None),
+    (CheckBox, {"label": "Check"}, True, None),
+    (ComboBox, {}, "Option 2", CHOICES),
+    (SpinCtrl, {}, 5, None),
+    (StaticText, {"label": "Label"}, "Label", None),
+    (PassCtrl, {}, "secret", None),
+    (ListBox, {"choices": CHOICES}, "Option 3", None),
+    (Slider, {}, 50, None),
+    (CheckListBox, {"choices": CHOICES}, ["Option 1"], None),
+    (RadioButton, {"label": "Radio"}, True, None),
+    (FloatSpin, {}, 1.5, None),
+    (IpAddrCtrl, {}, "10.0.0.1", None),
+    (NumCtrl, {}, 42, None),
+    (ColorPicker, {}, '{"red": 1, "green": 2, "blue": 3}', None),
+    (FolderBrowser, {}, "/tmp", None),
+    (FileBrowser, {}, "/tmp/file.txt", None),
+    (DatePickerCtrl, {}, None, None),
+    (TextFlow, {"label": "A few words to wrap"}, None, None),
+    (Button, {"label": "Button"}, None, None),
+    (StaticLine, {}, None, None),
+    (Grid, {"virtual": True, "columns": COLUMNS}, tableRows(100), None),
+    (ListCtrl, {"virtual": True, "columns": COLUMNS}, tableRows(100), None),
+    (TreeCtrl, {"loader": treeLoader}, None, None),
+    (CheckTreeCtrl, {}, {}, treeOptions(5, 10)),
+    (ComboBox, {"indexed": True}, "Option 2", CHOICES * 50),
+    (Notebook, {"pages": notebookPages(3, 5), "lazy": True}, None, None),
+)
+
+
+class AcceptAll(object):
+    """
+    A validator that is as cheap as possible, so fieldValidate is measured
+    rather than the validators.
+    """
+
+    def Validate(self, field):
+        return True, []
+
+
+def syntheticForm(fields, perSection=50, columns=4):
+    """
+    A form of `fields` fields cycling through FIELD_TYPES.  Fields are split
+    into sections, laid out alternately as a grid and as rows.
+    """
+    parts, values, options, validators = OrderedDict(), {}, {}, {}
+    for start in range(0, fields, perSection):
+        specs = []
+        for i in range(start, min(start + perSection, fields)):
+            control, kwargs, value, choices = FIELD_TYPES[i % len(FIELD_TYPES)]
+            name = f"F{i}"
+            specs.append(control.spec(name=name, **kwargs))
+            if value is not None:
+                values[name] = value
+            if choices is not None:
+                options[name] = choices
+            if control is TextCtrl:
+                validators[name] = AcceptAll
+        rows = [tuple(specs[i : i + columns]) for i in range(0, len(specs), columns)]
+        section = f"Section {start // perSection}"
+        if (start // perSection) % 2:
+            parts[section] = rows
+        else:
+            parts[section] = [rows]
+    form = dict(Parts=parts, Options=options, Validators=validators)
+    return form, values
+
+
+def nestedForm(depth, perLevel=2):
+    """
+    Containers nested `depth` deep, each holding a few fields.
+    """
+    parts = inner = OrderedDict()
+    for level in range(depth):
+        fields = [TextCtrl.spec(name=f"L{level}F{i}") for i in range(perLevel)]
+        child = OrderedDict()
+        inner[f"Level {level}"] = fields + [child] if level + 1 < depth else fields
+        inner = child
+    return dict(Parts=parts), {}
+
+
+def gridForm(rows, cols):
+    """
+    A single section holding one `rows` by `cols` grid of text fields.
+    """
+    grid = [
+        tuple(TextCtrl.spec(name=f"R{row}C{col}") for col in range(cols))
+        for row in range(rows)
+    ]
+    values = {f"R{row}C{col}": "x" for row in range(rows) for col in range(cols)}
+    return dict(Parts=OrderedDict(Grid=[grid])), values
+
+
+class SyntheticForm(Form):
+    def __init__(self, parent, form=None, **kwargs):
+        # Every instance needs its own copy, Form fills in the missing keys.
+        self.form = dict(form)
+        super(SyntheticForm, self).__init__(parent, **kwargs)
+
+
+def timed(func, repeat):
+    """
+    Runs `func` `repeat` times and returns the median time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def importCost(*modules):
+    """
+    Imports `modules` in a fresh interpreter, after wx itself, and returns
+    the time that took and which of HEAVY_MODULES got loaded.
+    """
+    code = (
+        "import importlib, json, sys, time\n"
+        "import wx\n"
+        "start = time.perf_counter()\n"
+        f"for name in {list(modules)!r}:\n"
+        "    importlib.import_module(name)\n"
+        "seconds = time.perf_counter() - start\n"
+        f"loaded = [name for name in {list(HEAVY_MODULES)!r} if name in sys.modules]\n"
+        "print(json.dumps([seconds, loaded]))\n"
+    )
+    # The child finds the package wherever this process found it.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, sys.path)))
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+        env=env,
+    ).stdout
+    seconds, loaded = json.loads(output.splitlines()[-1])
+    return seconds, loaded
+
+
+class Suite(object):
+    """
+    Runs the benchmarks and collects their results by name.
+    """
+
+    def __init__(self, repeat=5, only=None):
+        self.repeat = repeat
+        self.only = only
+        self.results = OrderedDict()
+        # Checks that failed outright, regardless of any baseline.
+        self.failures = []
+        self.frame = wx.Frame(None, size=(800, 600))
+        self.frame.Show()
+
+    def run(self, name, func, repeat=None):
+        if self.only and self.only not in name:
+            return
+        self.results[name] = timed(func, repeat or self.repeat)
+        print(f"{name:40} {self.results[name] * 1000:10.2f} ms")
+        sys.stdout.flush()
+
+    def build(self, form):
+        panel = SyntheticForm(self.frame, form=form)
+        self.frame.Layout()
+        return panel
+
+    def forms(self, label, form, values, repeat=None):
+        """
+        The benchmarks run against every generated form.
+        """
+        repeat = repeat or self.repeat
+        self.run(f"build[{label}]", lambda: self.build(form).Destroy(), repeat)
+        self.run(f"headless_layout[{label}]", lambda: layout(form), repeat)
+
+        def dialog():
+            dlg = FormDialog(self.frame, SyntheticForm, form=form)
+            wx.SafeYield()
+            dlg.Destroy()
+
+        self.run(f"dialog_open[{label}]", dialog, repeat)
+
+        panel = self.build(form)
+        names = list(panel.elements)
+        self.run(f"getitem[{label}]", lambda: [panel[name] for name in names])
+        self.run(f"get_values[{label}]", panel.get_values)
+
+        def setitems():
+            for name, value in values.items():
+                panel[name] = value
+
+        self.run(f"setitem[{label}]", setitems)
+        self.run(f"set_values[{label}]", lambda: panel.set_values(values))
+
+        def validateAll():
+            panel.validation.invalidate()
+            panel.fieldValidate()
+
+        self.run(f"validate_all[{label}]", validateAll)
+        if panel.form["Validators"]:
+            first = next(iter(panel.form["Validators"]))
+
+            def validateOne():
+                panel[first] = "changed"
+                panel.fieldValidate()
+
+            self.run(f"validate_one[{label}]", validateOne)
+
+        sizes = iter([(640, 480), (1024, 768)] * self.repeat)
+
+        def resize():
+            self.frame.SetSize(next(sizes))
+            self.frame.Layout()
+
+        self.run(f"relayout[{label}]", resize)
+        panel.Destroy()
+
+    def imports(self):
+        """
+        Importing Form, and Form with every control loaded, each in a fresh
+        interpreter.  The difference is what lazy loading of ExtendedControls
+        saves a form that doesn't use them.  Importing Form must not load any
+        of HEAVY_MODULES; if it does, the check fails.
+        """
+        form, extended = f"{__package__}.Form", f"{__package__}.ExtendedControls"
+        for name, modules in (
+            ("import[Form]", (form,)),
+            ("import[Form+Extended]", (form, extended)),
+        ):
+            if self.only and self.only not in name:
+                continue
+            runs = [importCost(*modules) for _ in range(self.repeat)]
+            self.results[name] = statistics.median(seconds for seconds, _ in runs)
+            print(f"{name:40} {self.results[name] * 1000:10.2f} ms")
+            if name == "import[Form]" and runs[0][1]:
+                print(f"  FAILED: importing Form loaded {', '.join(runs[0][1])}")
+                self.failures.append(name)
+        sys.stdout.flush()
+
+    def control(self, control, kwargs=None, options=None):
+        """
+        Builds a form holding just `control`, returning the form along with
+        the control's declarator.
+        """
+        spec = control.spec(name="Control", **(kwargs or {}))
+        form = dict(Parts=OrderedDict(Control=[spec]))
+        if options is not None:
+            form["Options"] = {"Control": options}
+        panel = self.build(form)
+        return panel, panel.elements["Control"]
+
+    def controls(self, size, repeat=None):
+        """
+        The controls with optimizations of their own, each given about `size`
+        rows, items or options.
+        """
+        data = tableRows(size)
+        panel, grid = self.control(Grid, {"virtual": True, "columns": COLUMNS})
+        self.run(f"grid_virtual_set[{size}]", lambda: grid.SetValue(data), repeat)
+        self.run(f"grid_virtual_get[{size}]", grid.GetValue, repeat)
+        panel.Destroy()
+
+        kwargs = {"virtual": True, "columns": COLUMNS}
+        panel, listCtrl = self.control(ListCtrl, kwargs)
+        self.run(
+            f"listctrl_virtual_set[{size}]", lambda: listCtrl.SetValue(data), repeat
+        )
+        self.run(f"listctrl_sort[{size}]", lambda: listCtrl.SortBy(1, False), repeat)
+        self.run(
+            f"listctrl_filter[{size}]", lambda: listCtrl.SetFilter("Name 1"), repeat
+        )
+        panel.Destroy()
+
+        loader = partial(treeLoader, width=size, depth=1)
+        self.run(
+            f"tree_lazy_build[{size}]",
+            lambda: self.control(TreeCtrl, {"loader": loader})[0].Destroy(),
+            repeat,
+        )
+        panel, tree = self.control(TreeCtrl, {"loader": loader})
+        items, (item, cookie) = [], tree.GetFirstChild(tree.GetRootItem())
+        while item.IsOk():
+            items.append(item)
+            item = tree.GetNextSibling(item)
+
+        def paths():
+            tree.InvalidatePaths()
+            for item in items:
+                tree.GetItemPath(item)
+
+        self.run(f"tree_paths[{size}]", paths, repeat)
+        panel.Destroy()
+
+        width = max(1, int(size**0.5))
+        options = treeOptions(width, width)
+        panel, checkTree = self.control(CheckTreeCtrl, options=options)
+        self.run(
+            f"checktree_options[{size}]", lambda: checkTree.SetOptions(options), repeat
+        )
+        states = iter([{}, {group: {} for group, entries in options}] * self.repeat)
+        self.run(
+            f"checktree_set[{size}]", lambda: checkTree.SetValue(next(states)), repeat
+        )
+        self.run(f"checktree_get[{size}]", checkTree.GetValue, repeat)
+        panel.Destroy()
+
+        choices = [f"Option {i}" for i in range(size)]
+        panel, combo = self.control(ComboBox, {"indexed": True})
+
+        def index():
+            combo.SetOptions(choices)
+            combo.index.Build()
+
+        self.run(f"combobox_index[{size}]", index, repeat)
+        self.run(
+            f"combobox_search[{size}]",
+            lambda: combo.index.Search("option 12", combo.limit),
+            repeat,
+        )
+        panel.Destroy()
+
+        pages = notebookPages(max(1, size // 50), 50)
+        kwargs = {"pages": pages, "lazy": True}
+        self.run(
+            f"notebook_lazy_build[{size}]",
+            lambda: self.control(Notebook, kwargs)[0].Destroy(),
+            repeat,
+        )
+        panel, notebook = self.control(Notebook, kwargs)
+        self.run(f"notebook_get[{size}]", notebook.GetValue, repeat)
+        panel.Destroy()
+
+    def flowSizer(self, count):
+        panel = wx.Panel(self.frame)
+        sizer = FlowSizer()
+        for i in range(count):
+            sizer.Add(wx.StaticText(panel, label=f"Word{i}"), 0, wx.ALL, 2)
+        panel.SetSizer(sizer)
+        self.frame.Layout()
+        widths = iter([300, 700] * self.repeat)
+
+        def relayout():
+            panel.SetSize((next(widths), 2000))
+            panel.Layout()
+
+        self.run(f"flowsizer_relayout[{count}]", relayout)
+        panel.Destroy()
+
+    def all(self, sizes=SIZES):
+        self.imports()
+        for size in sizes:
+            form, values = syntheticForm(size)
+            # The largest forms take long enough to not need many repeats.
+            self.forms(size, form, values, repeat=1 if size >= 1000 else None)
+        for depth in (10, 25):
+            self.forms(f"nested{depth}", *nestedForm(depth))
+        for rows, cols in ((50, 10), (200, 10)):
+            self.forms(f"grid{rows}x{cols}", *gridForm(rows, cols), repeat=1)
+        for count in (100, 1000):
+            self.flowSizer(count)
+        for size in (1000, 100000):
+            self.controls(size, repeat=1 if size >= 100000 else None)
+        return self.results
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Compares results with a baseline and returns the names of benchmarks
+    more than `tolerance` slower than their baseline.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name] if baseline[name] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:40} {baseline[name] * 1000:10.2f} -> {seconds * 1000:10.2f} ms"
+            f" ({ratio:.2f}x){flag}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="only run benchmarks containing this")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    app = wx.App()
+    suite = Suite(args.repeat, args.only)
+    results = suite.all([int(size) for size in args.sizes.split(",") if size])
+    suite.frame.Destroy()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    regressions = list(suite.failures)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions += compare(results, json.load(f), args.tolerance)
+    del app
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Keeping forms in sync with in-memory models, in both directions.
+
+A model is an Observable (fields are attributes) or an ObservableDict
+(fields are keys).  A ModelBinding connects the elements of a Form to the
+fields of a model:
+
+    customer = Observable(name="Ann", status=1)
+    binding = ModelBinding(form, customer, {"Name": "name", "Status": "status"})
+
+Changes the user makes are written to the model straight away, translated
+by the form's h2m.  Changes to the model are collected and written to the
+forms on the next pass of the event loop.  A field changed many times in a
+row is written once, with its latest value, to every form bound to the
+model, each form in a single set_values (so translated by m2h).  Models may
+be changed from worker threads.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from traceback import print_exc
+
+import wx
+
+logger = logging.getLogger("pyform")
+
+
+class Notifier(object):
+    """
+    Tells a model's observers which of its fields changed, once per pass of
+    the event loop.  Observers are called on the UI thread with the list of
+    changed fields.
+    """
+
+    def __init__(self):
+        self.observers = []
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._scheduled = False
+
+    def observe(self, observer):
+        self.observers.append(observer)
+
+    def unobserve(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def notify(self, key):
+        with self._lock:
+            self._pending[key] = None
+            if self._scheduled:
+                return
+            self._scheduled = True
+        wx.CallAfter(self.flush)
+
+    def flush(self):
+        with self._lock:
+            keys, self._pending = list(self._pending), OrderedDict()
+            self._scheduled = False
+        for observer in list(self.observers):
+            try:
+                observer(keys)
+            except Exception:
+                print_exc()
+
+
+class Observable(object):
+    """
+    A model whose public attributes are its fields.
+    """
+
+    def __init__(self, **fields):
+        object.__setattr__(self, "_notifier", Notifier())
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            self._notifier.notify(name)
+
+
+class ObservableDict(dict):
+    """
+    A model whose keys are its fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._notifier = Notifier()
+        super(ObservableDict, self).__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        super(ObservableDict, self).__setitem__(key, value)
+        self._notifier.notify(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+
+def notifier(model):
+    try:
+        return model._notifier
+    except AttributeError:
+        raise TypeError(f"{type(model).__name__} isn't observable.") from None
+
+
+def _has(model, key):
+    if isinstance(model, Mapping):
+        return key in model
+    return hasattr(model, key)
+
+
+def _get(model, key):
+    if isinstance(model, Mapping):
+        return model[key]
+    return getattr(model, key)
+
+
+def _set(model, key, value):
+    if isinstance(model, Mapping):
+        model[key] = value
+    else:
+        setattr(model, key, value)
+
+
+class ModelBinding(object):
+    """
+    Binds the elements of `form` to the fields of `model`.  `fields` maps
+    element names to model fields; a list binds elements to fields of the
+    same name, and by default every element the model has a field for is
+    bound.  The form is filled from the model straight away.
+    """
+
+    def __init__(self, form, model, fields=None):
+        self.form = form
+        self.model = model
+        self.notifier = notifier(model)
+        if fields is None:
+            fields = [name for name in form.elements if _has(model, name)]
+        if not isinstance(fields, Mapping):
+            fields = OrderedDict((name, name) for name in fields)
+        self.fields = OrderedDict(fields)
+        self.elements = OrderedDict()
+        for name, key in self.fields.items():
+            self.elements.setdefault(key, []).append(name)
+        # The element and value this binding last wrote to each model field,
+        # which don't need to be written back to that element.
+        self._sent = {}
+        self._writing = False
+        self.notifier.observe(self.modelChanged)
+        form.changeListeners.append(self.fieldChanged)
+        self.push()
+
+    def push(self, keys=None):
+        """
+        Writes model fields (all the bound ones by default) to the form.
+        Returns the FieldReport of the write, or None when nothing needed
+        writing.  Fields that couldn't be written are logged.
+        """
+        values = OrderedDict()
+        for key in self.elements if keys is None else keys:
+            if key not in self.elements or not _has(self.model, key):
+                continue
+            value = _get(self.model, key)
+            source, sent = self._sent.pop(key, (None, None))
+            for name in self.elements[key]:
+                if name != source or sent != value:
+                    values[name] = value
+        if not values:
+            return None
+        self._writing = True
+        try:
+            report = self.form.set_values(values)
+        finally:
+            self._writing = False
+        for name, error in report.errors.items():
+            logger.warning("Couldn't show %r in %s: %r", self.fields[name], name, error)
+        return report
+
+    def modelChanged(self, keys):
+        # Forms destroyed while still bound are falsy.
+        if not self.form:
+            self.unbind()
+            return
+        self.push(keys)
+
+    def fieldChanged(self, name):
+        if self._writing or name not in self.fields:
+            return
+        key = self.fields[name]
+        value = self.form[name]
+        self._sent[key] = (name, value)
+        _set(self.model, key, value)
+
+    def unbind(self):
+        self.notifier.unobserve(self.modelChanged)
+        if self.form and self.fieldChanged in self.form.changeListeners:
+            self.form.changeListeners.remove(self.fieldChanged)
@@ -5,26 +5,56 @@ Created on Nov 9, 2011
 
 This module contains custom classes to provide functionality from
 the wx module in specific ways.
+
+Controls built on wx submodules that are slow to import (wx.grid, wx.aui,
+wx.adv, wx.lib.agw, wx.lib.masked, wx.py, ...) live in ExtendedControls.
+They are still imported from here, and ExtendedControls is only loaded the
+first time one of them is asked for.
 """
 
+import importlib
 import json
-from collections import OrderedDict
-from itertools import product
+import logging
 
 import wx
-from wx.adv import DatePickerCtrl as DatePickerCtrl_
-from wx.aui import AuiNotebook
-from wx.grid import Grid as Grid_
-from wx.lib.agw.customtreectrl import CustomTreeCtrl as CustomTreeCtrl_
-from wx.lib.agw.floatspin import FloatSpin as FloatSpin_
-from wx.lib.agw.hyperlink import HyperLinkCtrl as HyperLinkCtrl_
-from wx.lib.combotreebox import MSWComboTreeBox
-from wx.lib.masked.ipaddrctrl import IpAddrCtrl as IpAddrCtrl_
-from wx.lib.masked.numctrl import NumCtrl as NumCtrl_
 from wx.lib.scrolledpanel import ScrolledPanel as ScrolledPanel_
-from wx.py.crust import Shell
 
-from .util.FlowSizer import FlowSizer
+from .util.RowIndex import RowIndex
+from .util.TextIndex import TextIndex
+from .util.WrappedText import WrappedText
+from .util.Workers import run_in_background
+
+logger = logging.getLogger("pyform")
+
+# The controls defined in ExtendedControls.
+EXTENDED = (
+    "ColumnarTable",
+    "Grid",
+    "NotebookPages",
+    "Notebook",
+    "ComboTreeBox",
+    "FloatSpin",
+    "IpAddrCtrl",
+    "CheckTreeCtrl",
+    "HyperlinkCtrl",
+    "Console",
+    "DatePickerCtrl",
+    "NumCtrl",
+)
+
+
+def __getattr__(name):
+    if name in EXTENDED:
+        control = getattr(
+            importlib.import_module(".ExtendedControls", __package__), name
+        )
+        globals()[name] = control
+        return control
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(EXTENDED))
 
 
 # from wx.lib.combotreebox import ComboTreeBox as _ComboTreeBox
@@ -101,37 +131,169 @@ class Row(object):
         return iter(self.items)
 
 
+# Keyword arguments that are consumed by the declarator rather than passed on
+# to the wx element.  Their defaults live on wxPlaceHolder.
+LAYOUT_KWARGS = (
+    "proportion",
+    "flags",
+    "rowGrowable",
+    "colGrowable",
+    "border",
+    "span",
+    "rowpos",
+    "colpos",
+    "expand",
+    "local",
+    "admin",
+    "gap",
+    "maxlength",
+)
+
+
+class Spec(object):
+    """
+    The Spec Class is an immutable, hashable declaration of a control.  It
+    holds the control class and the keyword arguments it will be created
+    with, so a Parts structure made of Specs can be defined once at module
+    level and built into any number of forms.  Form creates the actual
+    declarator through `create` when the widget is made.
+    """
+
+    __slots__ = ("control", "options", "name") + LAYOUT_KWARGS
+
+    def __init__(self, control, **kwargs):
+        init = object.__setattr__
+        init(self, "control", control)
+        init(self, "options", tuple(sorted(kwargs.items())))
+        init(self, "name", kwargs.get("name", None))
+        # Layout properties are needed before the control exists.
+        for attr in LAYOUT_KWARGS:
+            init(self, attr, kwargs.get(attr, getattr(control, attr, None)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Spec is immutable.")
+
+    def __reduce__(self):
+        return (_spec, (self.control, self.options))
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Spec)
+            and self.control is other.control
+            and self.options == other.options
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.control, _freeze(self.options)))
+
+    def __repr__(self):
+        options = ", ".join(f"{key}={value!r}" for key, value in self.options)
+        return f"{self.control.__name__}.spec({options})"
+
+    def create(self):
+        """
+        Returns a new, unbuilt declarator for this Spec.
+        """
+        return self.control(**dict(self.options))
+
+
+def _spec(control, options):
+    return Spec(control, **dict(options))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple((key, _freeze(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
 class wxPlaceHolder(object):
+    # Layout defaults are kept on the class, declarators only store the
+    # values that were actually provided.
+    name = None
+    proportion = 0
+    flags = wx.ALL | wx.ALIGN_CENTER_VERTICAL
+    rowGrowable = False
+    colGrowable = False
+    border = 0
+    span = (1, 1)
+    size = (-1, -1)
+    rowpos = None
+    colpos = None
+    expand = True
+    local = False
+    admin = False
+    gap = None
+    maxlength = None
+    # The events a control sends when the user changes its value.  The Form
+    # binds these on the made element to track which fields changed.
+    changeEvents = ()
+    # What GetValue returns for a control made without a value.
+    emptyValue = None
+
     def __init__(self, **kwargs):
         # To facilitate advanced forms, declarators will end up with access
         # to the Form's element list.
         self._elements = None
         # Pull anything that doesn't belong to the actual element out of the
         # kwargs for use when adding to the sizer, etc.
-        self.name = kwargs.get("name", None)
-        self.proportion = kwargs.pop("proportion", 0)
-        self.flags = kwargs.pop("flags", wx.ALL | wx.ALIGN_CENTER_VERTICAL)
-        self.rowGrowable = kwargs.pop("rowGrowable", False)
-        self.colGrowable = kwargs.pop("colGrowable", False)
-        self.border = kwargs.pop("border", 0)
-        self.span = kwargs.pop("span", (1, 1))
-        self.size = kwargs.get("size", (-1, -1))
-        self.rowpos = kwargs.pop("rowpos", None)
-        self.colpos = kwargs.pop("colpos", None)
-        self.expand = kwargs.pop("expand", True)
-        self.local = kwargs.pop("local", False)
-        self.admin = kwargs.pop("admin", False)
-        self.gap = kwargs.pop("gap", None)
-        self.maxlength = kwargs.pop("maxlength", None)
+        if "name" in kwargs:
+            self.name = kwargs["name"]
+        if "size" in kwargs:
+            self.size = kwargs["size"]
+        for attr in LAYOUT_KWARGS:
+            if attr in kwargs:
+                setattr(self, attr, kwargs.pop(attr))
         self.kwargs = kwargs
 
+    @classmethod
+    def spec(cls, **kwargs):
+        """
+        Declares this control as a reusable Spec instead of a live declarator.
+        """
+        return Spec(cls, **kwargs)
+
+    @classmethod
+    def DeclaredValue(cls, kwargs):
+        """
+        The value GetValue returns once a control declared with `kwargs` is
+        made, for controls that haven't been built yet.
+        """
+        return kwargs.get("value", cls.emptyValue)
+
+    def ValueStamp(self):
+        """
+        A cheap token that changes whenever the value does, for controls whose
+        value is expensive to read or is live data.  Dirty tracking compares
+        stamps instead of values for them.  None means there isn't one.
+        """
+        return None
+
     def Validate(self):
-        if hasattr(self, "validator") and self.validator:
-            return self.validator().Validate(self)
+        validator = self.ValidatorInstance()
+        if validator is not None:
+            return validator.Validate(self)
         return True, []
 
     def SetValidator(self, validator):
         self.validator = validator
+        self._validatorInstance = None
+
+    def ValidatorInstance(self):
+        """
+        Returns the field's validator, instantiated once and reused by every
+        later validation, or None when the field has no validator.
+        """
+        if not getattr(self, "validator", None):
+            return None
+        if getattr(self, "_validatorInstance", None) is None:
+            self._validatorInstance = self.validator()
+        return self._validatorInstance
 
 
 class ScrolledPanel(wxPlaceHolder, ScrolledPanel_):
@@ -177,6 +339,9 @@ class StaticLine(wxPlaceHolder, wx.StaticLine):
 
 
 class ListBox(wxPlaceHolder, wx.ListBox):
+    changeEvents = (wx.EVT_LISTBOX,)
+    emptyValue = ""
+
     def make(self, parent):
         wx.ListBox.__init__(self, parent, **self.kwargs)
         return self
@@ -208,75 +373,120 @@ class StaticText(wxPlaceHolder, wx.StaticText):
     def GetValue(self):
         return self.GetLabel()
 
+    @classmethod
+    def DeclaredValue(cls, kwargs):
+        return kwargs.get("label", "")
+
     def SetBackgroundColor(self, *args, **kwargs):
         return self.SetBackgroundColour(*args, **kwargs)
 
 
-class Grid(wxPlaceHolder, Grid_):
-    def __init__(self, *args, **kwargs):
-        self._selected = None
-        wxPlaceHolder.__init__(self, *args, **kwargs)
-
-    def make(self, parent):
-        Grid_.__init__(self, parent, **self.kwargs)
-        return self
-
-    def GetValue(self):
-        pass
-
-    def SetValue(self, val):
-        pass
-
-    def GetSelectedCells(self, *args, **kwargs):
-        cells = []
-        topleft = self.GetSelectionBlockTopLeft()
-        if topleft:
-            bottomright = self.GetSelectionBlockBottomRight()
-            cells.extend(self.CellsByCorners(topleft, bottomright))
-        cells.extend(super(Grid, self).GetSelectedCells())
-        if not cells:
-            cells.extend([self.GetGridCursorPos()])
-        return cells
-
-    def GetGridCursorPos(self):
-        return self.GetGridCursorRow(), self.GetGridCursorCol()
-
-    def CellsByCorners(self, toplefts, bottomrights):
-        cells = []
-        for (rowstart, colstart), (rowend, colend) in zip(toplefts, bottomrights):
-            cells.extend(
-                product(range(rowstart, rowend + 1), range(colstart, colend + 1))
-            )
-        return cells
+class ListCtrl(wxPlaceHolder, wx.ListCtrl):
+    """
+    With `virtual=True` the list is a virtual report view bound to a sequence
+    of rows (or any object with __len__ and __getitem__, like a ColumnStore)
+    through SetValue.  Rows are drawn on demand, and sorting (by clicking a
+    column) or filtering only rebuilds the RowIndex view, never the items.
+    `columns` provides the column headings.
+    """
 
+    index = None
 
-class ListCtrl(wxPlaceHolder, wx.ListCtrl):
     def __init__(self, *args, **kwargs):
         self._selected = None
+        self._version = 0
         wxPlaceHolder.__init__(self, *args, **kwargs)
 
     def make(self, parent):
+        virtual = self.kwargs.pop("virtual", False)
+        columns = self.kwargs.pop("columns", ())
+        if virtual:
+            style = self.kwargs.get("style", 0)
+            self.kwargs["style"] = style | wx.LC_REPORT | wx.LC_VIRTUAL
         wx.ListCtrl.__init__(self, parent, **self.kwargs)
+        if virtual:
+            self.index = RowIndex()
+            for col, heading in enumerate(columns):
+                self.InsertColumn(col, heading)
+            self.Bind(wx.EVT_LIST_COL_CLICK, self.onColClick)
         return self
 
+    def OnGetItemText(self, item, col):
+        return str(self.index.GetRow(item)[col])
+
+    def onColClick(self, evt):
+        evt.Skip()
+        col = evt.GetColumn()
+        ascending = not self.index.ascending if col == self.index.column else True
+        self.SortBy(col, ascending)
+
+    def SortBy(self, col, ascending=True):
+        row = self.GetSelectedRow()
+        self.index.Sort(col, ascending)
+        self._refreshView(row)
+
+    def SetFilter(self, text):
+        row = self.GetSelectedRow()
+        self.index.Filter(text)
+        self._refreshView(row)
+
+    def _refreshView(self, row=None):
+        """
+        Shows the current view, keeping `row` of the bound sequence selected
+        wherever the view put it.
+        """
+        selected = self.GetSelection()
+        if selected is not None:
+            super(ListCtrl, self).Select(selected, False)
+        self.SetItemCount(len(self.index))
+        if row is not None:
+            item = self.index.GetItem(row)
+            if item is not None:
+                super(ListCtrl, self).Select(item)
+        self.Refresh()
+
     def Select(self, idx, **kwargs):
         self._selected = idx
         return super(ListCtrl, self).Select(idx)
 
     def GetSelection(self):
-        return self._selected
+        if self.index is None:
+            return self._selected
+        # Virtual lists are asked, the user may have selected with the mouse.
+        item = self.GetFirstSelected()
+        return None if item == -1 else item
 
     def GetTextSelection(self):
-        return self.GetItemText(self._selected)
+        return self.GetItemText(self.GetSelection())
+
+    def GetSelectedRow(self):
+        """
+        Returns the position of the selected row in the bound sequence.
+        """
+        selected = self.GetSelection()
+        if self.index is None or selected is None:
+            return selected
+        return self.index.GetRowIndex(selected)
 
     def GetValue(self):
-        pass
+        if self.index is not None:
+            return self.index.rows
 
     def SetValue(self, val):
-        pass
+        if self.index is not None and val is not None:
+            self.index.SetRows(val)
+            self._version += 1
+            self._refreshView()
+
+    def ValueStamp(self):
+        if self.index is not None:
+            return self._version, getattr(self.index.rows, "version", None)
 
 
 class CheckListBox(wxPlaceHolder, wx.CheckListBox):
+    changeEvents = (wx.EVT_CHECKLISTBOX,)
+    emptyValue = ()
+
     def __init__(self, *args, **kwargs):
         wxPlaceHolder.__init__(self, *args, **kwargs)
 
@@ -292,73 +502,47 @@ class CheckListBox(wxPlaceHolder, wx.CheckListBox):
 
 
 class TextFlow(wxPlaceHolder):
+    """
+    A paragraph of word wrapped text, drawn by a single WrappedText window.
+    """
+
     def make(self, parent):
         bold = self.kwargs.pop("bold", False)
         size = self.kwargs.pop("fontsize", None)
-        self.element = FlowSizer()
-        self.words = []
-        for word in self.kwargs["label"].split():
-            text = wx.StaticText(parent, label=word)
-            if size or bold:
-                font = text.GetFont()
-                if size is not None:
-                    font.SetPointSize(size)
-                if bold:
-                    font.SetWeight(wx.BOLD)
-                text.SetFont(font)
-            self.words.append(text)
-            self.element.Add(text, flag=wx.TOP | wx.RIGHT, border=2)
+        self.element = WrappedText(parent, **self.kwargs)
+        if size or bold:
+            font = self.element.GetFont()
+            if size is not None:
+                font.SetPointSize(size)
+            if bold:
+                font.SetWeight(wx.BOLD)
+            self.element.SetFont(font)
         return self.element
 
     def SetValue(self, val):
         pass
 
     def GetValue(self):
-        return " ".join(word.GetLabel() for word in self.words)
-
-
-class Notebook(wxPlaceHolder, AuiNotebook):
-    def make(self, parent):
-        # pull pages.
-        self._pdict = self.kwargs.pop("pages", OrderedDict())
-        self.pages = dict()
-        # No name kwarg to Notebooks.
-        self.name = self.kwargs.pop("name")
-        AuiNotebook.__init__(self, parent, **self.kwargs)
-        # This is shady, but if it works.
-        from src.pyform.Form import Form
-
-        for tabname, contents in self._pdict.items():
-
-            class temp(Form):
-                def __init__(self, parent):
-                    self.form = dict()
-                    parts = self.form["Parts"] = OrderedDict()
-                    parts[tabname] = contents
-                    super(temp, self).__init__(parent, gap=1)
-
-            # panel = wx.Panel(self)
-            page = temp(self)
-            if isinstance(tabname, tuple):
-                tabname = tabname[0]
-            self.AddPage(page, tabname)
-            self.pages[tabname] = page
-        return self
-
-    def GetValue(self):
-        pass
+        return self.element.GetLabel()
 
-    def SetValue(self, val):
-        pass
+    @classmethod
+    def DeclaredValue(cls, kwargs):
+        return kwargs.get("label", "")
 
 
 class CheckBox(wxPlaceHolder, wx.CheckBox):
+    changeEvents = (wx.EVT_CHECKBOX,)
+    emptyValue = False
+
     def make(self, parent):  # @ReservedAssignment
         wx.CheckBox.__init__(self, parent, **self.kwargs)
         return self
 
 
 class TextCtrl(wxPlaceHolder, wx.TextCtrl):
+    changeEvents = (wx.EVT_TEXT,)
+    emptyValue = ""
+
     def make(self, parent):  # @ReservedAssignment
         wx.TextCtrl.__init__(self, parent, **self.kwargs)
         if self.maxlength:
@@ -403,6 +587,8 @@ class ListHolder(wxPlaceHolder):
 
 
 class FolderBrowser(wxPlaceHolder, wx.DirPickerCtrl):
+    changeEvents = (wx.EVT_DIRPICKER_CHANGED,)
+
     def make(self, parent):  # @ReservedAssignment
         wx.DirPickerCtrl.__init__(self, parent, **self.kwargs)
         self.GetTextCtrl().SetEditable(False)
@@ -420,8 +606,14 @@ class FolderBrowser(wxPlaceHolder, wx.DirPickerCtrl):
     def GetValue(self):
         return self.GetPath()
 
+    @classmethod
+    def DeclaredValue(cls, kwargs):
+        return kwargs.get("path", "")
+
 
 class FileBrowser(wxPlaceHolder, wx.FilePickerCtrl):
+    changeEvents = (wx.EVT_FILEPICKER_CHANGED,)
+
     def make(self, parent):
         wx.FilePickerCtrl.__init__(self, parent, **self.kwargs)
         self.GetTextCtrl().SetEditable(False)
@@ -438,12 +630,134 @@ class FileBrowser(wxPlaceHolder, wx.FilePickerCtrl):
             pass
         return val
 
+    @classmethod
+    def DeclaredValue(cls, kwargs):
+        return kwargs.get("path", "")
+
 
 class TreeCtrl(wxPlaceHolder, wx.TreeCtrl):
+    """
+    Item paths are cached, so GetValue only walks up the tree the first time
+    an item is looked at.  Passing a `loader` makes the tree lazy: the loader
+    is called with an item's path (see GetItemPath) when the item is first
+    expanded, and returns its children as labels or (label, hasChildren)
+    tuples.  With `threaded=True` loaders run on a worker thread.
+    """
+
+    changeEvents = (wx.EVT_TREE_SEL_CHANGED,)
+
+    loader = None
+
     def make(self, parent):
+        self.loader = self.kwargs.pop("loader", None)
+        self.threaded = self.kwargs.pop("threaded", False)
+        root = self.kwargs.pop("root", "")
+        self._paths = {}
+        self._unloaded = set()
+        self._loading = set()
         wx.TreeCtrl.__init__(self, parent, **self.kwargs)
+        self.Bind(wx.EVT_TREE_DELETE_ITEM, self.onDeleteItem)
+        self.Bind(wx.EVT_TREE_END_LABEL_EDIT, self.onEndLabelEdit)
+        if self.loader is not None:
+            self.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.onExpanding)
+            self.LoadChildren(self.AddRoot(root))
         return self
 
+    def onDeleteItem(self, evt):
+        evt.Skip()
+        self._paths.pop(evt.GetItem(), None)
+        self._unloaded.discard(evt.GetItem())
+        self._loading.discard(evt.GetItem())
+
+    def onEndLabelEdit(self, evt):
+        evt.Skip()
+        self.InvalidatePaths()
+
+    def onExpanding(self, evt):
+        evt.Skip()
+        item = evt.GetItem()
+        if item in self._unloaded:
+            self.LoadChildren(item)
+
+    def DeleteAllItems(self):
+        self.InvalidatePaths()
+        self._unloaded.clear()
+        self._loading.clear()
+        return super(TreeCtrl, self).DeleteAllItems()
+
+    def InvalidatePaths(self):
+        """
+        Forgets every cached path, for use after items are renamed or moved.
+        """
+        self._paths.clear()
+
+    def LoadChildren(self, item):
+        """
+        Asks the loader for an item's children and adds them to the tree.
+        """
+        self._unloaded.discard(item)
+        path = self.GetItemPath(item)
+        if self.threaded:
+            self._loading.add(item)
+            run_in_background(
+                self.loader, lambda future: self._loaded(item, future), path
+            )
+        else:
+            try:
+                children = self.loader(path)
+            except Exception:
+                self._loadFailed(item)
+                return
+            self.AppendChildren(item, children)
+
+    def _loaded(self, item, future):
+        # The item may have gone away while its children were loading.
+        if item not in self._loading:
+            return
+        self._loading.discard(item)
+        try:
+            children = future.result()
+        except Exception:
+            self._loadFailed(item)
+            return
+        self.AppendChildren(item, children)
+        if self.ItemHasChildren(item):
+            self.Expand(item)
+
+    def _loadFailed(self, item):
+        logger.exception("Couldn't load the children of %r", self.GetItemPath(item))
+        # Leave no expander behind that can't do anything.
+        self.SetItemHasChildren(item, False)
+
+    def AppendChildren(self, item, children):
+        self.Freeze()
+        try:
+            for child in children:
+                label, hasChildren = (child, True) if isinstance(child, str) else child
+                childId = self.AppendItem(item, label)
+                if hasChildren:
+                    self.SetItemHasChildren(childId, True)
+                    self._unloaded.add(childId)
+        finally:
+            self.Thaw()
+
+    def GetItemPath(self, item):
+        """
+        Returns the labels from the top of the tree (below the root) down to
+        `item`, translated through the parent's netcache where available.
+        """
+        path = self._paths.get(item)
+        if path is None:
+            parent = self.GetItemParent(item)
+            if not parent:
+                path = ()
+            else:
+                piece = self.GetItemText(item)
+                netcache = getattr(getattr(self, "parent", None), "netcache", {})
+                path = self.GetItemPath(parent) + (netcache.get(piece, piece),)
+            self._paths[item] = path
+        return path
+
     def SetValue(self, val):
         pass
 
@@ -451,14 +765,10 @@ class TreeCtrl(wxPlaceHolder, wx.TreeCtrl):
         if self.GetWindowStyle() & wx.TR_MULTIPLE:
             return
         if selection is None:
-            pieces = []
             item = self.GetSelection()
             if not item:
                 return None
-            while self.GetItemParent(item):
-                piece = self.GetItemText(item)
-                pieces.insert(0, self.parent.netcache.get(piece, piece))
-                item = self.GetItemParent(item)
+            pieces = self.GetItemPath(item)
             if pieces[1:]:
                 return "\\".join(pieces[1:])
             else:
@@ -467,28 +777,97 @@ class TreeCtrl(wxPlaceHolder, wx.TreeCtrl):
 
 
 class ComboBox(wxPlaceHolder, wx.ComboBox):
+    """
+    With `indexed=True` the options are kept in a TextIndex instead of the
+    control, and the drop down only ever holds the best `limit` matches for
+    the text typed so far.  The index is built on a worker thread; typing is
+    only filtered once it's ready.
+    """
+
+    changeEvents = (wx.EVT_TEXT, wx.EVT_COMBOBOX)
+    emptyValue = ""
+
+    index = None
+
     def make(self, parent):
+        indexed = self.kwargs.pop("indexed", False)
+        self.limit = self.kwargs.pop("limit", 50)
         wx.ComboBox.__init__(self, parent, **self.kwargs)
+        if indexed:
+            self.index = TextIndex()
+            self._shown = []
+            self.Bind(wx.EVT_TEXT, self.onFilterText)
         return self
 
     def GetId(self):
         return wx.ComboBox.GetId(self)
 
     def SetOptions(self, options):
-        self.Clear()
-        self.AppendItems(options)
+        if self.index is None:
+            self.Clear()
+            self.AppendItems(options)
+            return
+        index = self.index = TextIndex(options)
+        # Index in the background.  Until it's built the drop down holds the
+        # first options, unfiltered, rather than blocking the UI on a search.
+        run_in_background(index.Build, lambda future: self.onIndexBuilt(index))
+        self._showMatches(index.Search("", self.limit))
+
+    def onIndexBuilt(self, index):
+        # The options may have been replaced, or the control destroyed.
+        if self and index is self.index:
+            self._filter()
+
+    def onFilterText(self, evt):
+        evt.Skip()
+        if self.index.IsBuilt():
+            self._filter()
+
+    def _filter(self):
+        self._showMatches(self.index.Search(self.GetValue(), self.limit))
+
+    def _showMatches(self, matches):
+        """
+        Updates the drop down in place, keeping the items it already shares
+        with `matches` and leaving the typed text alone.
+        """
+        if matches == self._shown:
+            return
+        common = 0
+        for old, new in zip(self._shown, matches):
+            if old != new:
+                break
+            common += 1
+        text, point = self.GetValue(), self.GetInsertionPoint()
+        for item in reversed(range(common, len(self._shown))):
+            self.Delete(item)
+        if matches[common:]:
+            self.AppendItems(matches[common:])
+        self._shown = matches
+        if self.GetValue() != text:
+            self.ChangeValue(text)
+            self.SetInsertionPoint(point)
 
     def SetBackgroundColor(self, color):
         return self.SetBackgroundColour(color)
 
 
 class SpinCtrl(wxPlaceHolder, wx.SpinCtrl):
+    changeEvents = (wx.EVT_SPINCTRL,)
+
     def make(self, parent):
         wx.SpinCtrl.__init__(self, parent, **self.kwargs)
         return self
 
+    @classmethod
+    def DeclaredValue(cls, kwargs):
+        return max(kwargs.get("initial", 0), kwargs.get("min", 0))
+
 
 class RadioButton(wxPlaceHolder, wx.RadioButton):
+    changeEvents = (wx.EVT_RADIOBUTTON,)
+    emptyValue = False
+
     def make(self, parent):
         wx.RadioButton.__init__(self, parent, **self.kwargs)
         return self
@@ -510,6 +889,8 @@ class StaticBitmap(wxPlaceHolder):
 
 
 class ColorPicker(wxPlaceHolder):
+    changeEvents = (wx.EVT_COLOURPICKER_CHANGED,)
+
     def make(self, parent):
         self.element = wx.ColourPickerCtrl(parent, **self.kwargs)
         return self.element
@@ -523,118 +904,18 @@ class ColorPicker(wxPlaceHolder):
             {"red": color.Red(), "green": color.Green(), "blue": color.Blue()}
         )
 
+    @classmethod
+    def DeclaredValue(cls, kwargs):
+        color = wx.Colour(kwargs.get("colour", wx.BLACK))
+        return json.dumps(
+            {"red": color.Red(), "green": color.Green(), "blue": color.Blue()}
+        )
 
-class Slider(wxPlaceHolder, wx.Slider):
-    def make(self, parent):
-        wx.Slider.__init__(self, parent, **self.kwargs)
-        return self
-
-
-class ComboTreeBox(wxPlaceHolder, MSWComboTreeBox):
-    def make(self, parent):
-        MSWComboTreeBox.__init__(self, parent, **self.kwargs)
-        return self
-
-    #   def SetValue(self, val):
-    #     super(ComboTreeBox, self).SetValue(val)
-    #     self.element._text.SetInsertionPoint(0)
-
-    #   def Getvalue(self, val):
-    #     pass
-
-    #   def GetClientData(self, selection):
-    #     return self.element.GetClientData(selection)
-
-    def SetOptions(self, choices):
-        for category, options in choices:
-            id = self.Append(category)  # @ReservedAssignment
-            for option in options:
-                self.Append(option, parent=id, clientData=category)
-            if self.expand:
-                self.GetTree().Expand(id)
-
-
-class FloatSpin(wxPlaceHolder, FloatSpin_):
-    def make(self, parent):
-        FloatSpin_.__init__(self, parent, **self.kwargs)
-        return self
-
-
-class IpAddrCtrl(wxPlaceHolder, IpAddrCtrl_):
-    def make(self, parent):
-        IpAddrCtrl_.__init__(self, parent, **self.kwargs)
-        return self
-
-
-class CheckTreeCtrl(wxPlaceHolder, CustomTreeCtrl_):
-    def make(self, parent):
-        CustomTreeCtrl_.__init__(self, parent, **self.kwargs)
-        return self
-
-    def SetOptions(self, options):
-        self.byname = {}
-        root = self.AddRoot("")
-        for parent, children in options:
-            parentid = self.AppendItem(root, parent)
-            self.byname[parent] = {}
-            for child in children:
-                childid = self.AppendItem(parentid, child, ct_type=1)
-                self.byname[parent][child] = childid
-        self.ExpandAll()
-
-    def GetValue(self):
-        value = {}
-        root = self.GetRootItem()
-        elem, cookie = self.GetFirstChild(root)
-        while elem:
-            parent = self.GetItemText(elem)
-            value[parent] = {}
-            sub, cookie2 = self.GetFirstChild(elem)
-            while sub:
-                child = self.GetItemText(sub)
-                value[parent][child] = self.IsItemChecked(sub)
-                sub, cookie2 = self.GetNextChild(elem, cookie2)
-            elem, cookie = self.GetNextChild(root, cookie)
-        return value
-
-    def SetValue(self, val):
-        for parent, children in self.byname.items():
-            for child, item in children.items():
-                try:
-                    self.CheckItem(item, val[parent][child])
-                except KeyError:
-                    # Assume missing keys are for newly added entries.  Default to true.
-                    self.CheckItem(item, True)
-
-
-class HyperlinkCtrl(wxPlaceHolder, HyperLinkCtrl_):
-    def make(self, parent):
-        HyperLinkCtrl_.__init__(parent, -1, **self.kwargs)
-        return self
-
-    def GetValue(self):
-        return self.GetURL()
-
-    def SetValue(self, val):
-        self.SetURL(val)
-
-    def SetLabel(self, label):
-        self.SetLabel(label)
-
-
-class Console(wxPlaceHolder):
-    def make(self, parent):
-        self.element = Shell(parent=parent)
-        return self.element
-
-
-class DatePickerCtrl(wxPlaceHolder, DatePickerCtrl_):
-    def make(self, parent):
-        DatePickerCtrl_.__init__(self, parent, **self.kwargs)
-        return self
 
+class Slider(wxPlaceHolder, wx.Slider):
+    changeEvents = (wx.EVT_SLIDER,)
+    emptyValue = 0
 
-class NumCtrl(wxPlaceHolder, NumCtrl_):
     def make(self, parent):
-        NumCtrl_.__init__(self, parent, **self.kwargs)
+        wx.Slider.__init__(self, parent, **self.kwargs)
         return self
@@ -50,6 +50,7 @@ class MainDemo(Form):
                     Button(name="AlternateDeclaration", label="Another Way"),
                     Button(name="LineDemo", label="Static Lines"),
                     Button(name="AddButtons", label="Custom Buttons"),
+                    Button(name="SharedTemplate", label="Shared Template"),
                 ),
             ]
         )
@@ -451,6 +452,25 @@ class AddButtons(Form):
         super().__init__(parent, **kwargs)
 
 
+# Specs never become widgets themselves, so a declaration made of them can live
+# at module level and be shared by every instance of the form.
+TEMPLATE_PARTS = OrderedDict()
+TEMPLATE_PARTS[("Shared Template", Form.G)] = [
+    StaticText.spec(label="This declaration was made once, at import."),
+    (
+        StaticText.spec(label="Name"),
+        TextCtrl.spec(name="Name", proportion=1),
+    ),
+    CheckBox.spec(name="Active", label="Every dialog gets its own widgets."),
+]
+
+
+class SharedTemplate(Form):
+    def __init__(self, parent, **kwargs):
+        self.form = dict(Title="Shared Template", Parts=TEMPLATE_PARTS)
+        super(SharedTemplate, self).__init__(parent, **kwargs)
+
+
 if __name__ == "__main__":
     app = wx.App()
     f = wx.Frame(None)
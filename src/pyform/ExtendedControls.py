@@ -0,0 +1,469 @@
+"""
+Controls built on wx submodules that take a while to import.  Import them
+from Controls as usual; this module is only loaded when one of them is
+first used, so forms that don't need them don't pay for the imports.
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import wx
+from wx.adv import EVT_DATE_CHANGED
+from wx.adv import DatePickerCtrl as DatePickerCtrl_
+from wx.aui import EVT_AUINOTEBOOK_PAGE_CHANGED, AuiNotebook
+from wx.grid import (
+    EVT_GRID_CELL_CHANGED,
+    EVT_GRID_CELL_CHANGING,
+    GRIDTABLE_NOTIFY_COLS_APPENDED,
+    GRIDTABLE_NOTIFY_COLS_DELETED,
+    GRIDTABLE_NOTIFY_ROWS_APPENDED,
+    GRIDTABLE_NOTIFY_ROWS_DELETED,
+    GRIDTABLE_REQUEST_VIEW_GET_VALUES,
+)
+from wx.grid import Grid as Grid_
+from wx.grid import GridTableBase, GridTableMessage
+from wx.lib.agw.customtreectrl import EVT_TREE_ITEM_CHECKED
+from wx.lib.agw.customtreectrl import CustomTreeCtrl as CustomTreeCtrl_
+from wx.lib.agw.floatspin import EVT_FLOATSPIN
+from wx.lib.agw.floatspin import FloatSpin as FloatSpin_
+from wx.lib.agw.hyperlink import HyperLinkCtrl as HyperLinkCtrl_
+from wx.lib.combotreebox import MSWComboTreeBox
+from wx.lib.masked.ipaddrctrl import IpAddrCtrl as IpAddrCtrl_
+from wx.lib.masked.numctrl import EVT_NUM
+from wx.lib.masked.numctrl import NumCtrl as NumCtrl_
+from wx.py.crust import Shell
+
+from .Controls import Spec, wxPlaceHolder
+from .util.CellRegion import CellRegion
+from .util.ColumnStore import ColumnStore
+
+
+class ColumnarTable(GridTableBase):
+    """
+    A virtual grid table backed by a ColumnStore.  The grid only asks the
+    table for the cells it is actually drawing.
+    """
+
+    def __init__(self, store):
+        GridTableBase.__init__(self)
+        self.store = store
+
+    def GetNumberRows(self):
+        return len(self.store)
+
+    def GetNumberCols(self):
+        return len(self.store.names)
+
+    def IsEmptyCell(self, row, col):
+        return False
+
+    def GetValue(self, row, col):
+        value = self.store.GetCell(row, col)
+        return "" if value is None else str(value)
+
+    def SetValue(self, row, col, value):
+        try:
+            self.store.SetCell(row, col, value)
+        except (ValueError, TypeError, OverflowError):
+            # The cell keeps its value, Grid vetoes edits like these before
+            # they get here.
+            pass
+
+    def GetColLabelValue(self, col):
+        return str(self.store.names[col])
+
+
+class Grid(wxPlaceHolder, Grid_):
+    """
+    With `virtual=True` the grid is backed by a ColumnarTable, and GetValue and
+    SetValue read and replace the whole dataset at once.  `columns` names the
+    columns of an initially empty table.
+    """
+
+    changeEvents = (EVT_GRID_CELL_CHANGED,)
+    store = None
+
+    def __init__(self, *args, **kwargs):
+        self._selected = None
+        wxPlaceHolder.__init__(self, *args, **kwargs)
+
+    def make(self, parent):
+        virtual = self.kwargs.pop("virtual", False)
+        columns = self.kwargs.pop("columns", ())
+        Grid_.__init__(self, parent, **self.kwargs)
+        if virtual:
+            self.store = ColumnStore(columns)
+            self.table = ColumnarTable(self.store)
+            self.SetTable(self.table, True)
+            self.Bind(EVT_GRID_CELL_CHANGING, self.onCellChanging)
+        return self
+
+    def onCellChanging(self, evt):
+        # Reject text the column can't hold, like "abc" in an integer column.
+        try:
+            self.store.Convert(evt.GetCol(), evt.GetString())
+        except (ValueError, TypeError, OverflowError):
+            evt.Veto()
+            return
+        evt.Skip()
+
+    def GetValue(self):
+        if self.store is not None:
+            return self.store.ToDict()
+
+    def SetValue(self, val):
+        if self.store is not None and val is not None:
+            self._updateTable(self.store.Replace, val)
+
+    def ValueStamp(self):
+        if self.store is not None:
+            return self.store.version
+
+    def AppendValues(self, val):
+        """
+        Appends a batch of rows to a virtual grid.
+        """
+        self._updateTable(self.store.Extend, val)
+
+    def _updateTable(self, update, val):
+        rows, cols = len(self.store), len(self.store.names)
+        update(val)
+        self.BeginBatch()
+        for old, new, deleted, appended in (
+            (
+                rows,
+                len(self.store),
+                GRIDTABLE_NOTIFY_ROWS_DELETED,
+                GRIDTABLE_NOTIFY_ROWS_APPENDED,
+            ),
+            (
+                cols,
+                len(self.store.names),
+                GRIDTABLE_NOTIFY_COLS_DELETED,
+                GRIDTABLE_NOTIFY_COLS_APPENDED,
+            ),
+        ):
+            if new < old:
+                message = GridTableMessage(self.table, deleted, new, old - new)
+                self.ProcessTableMessage(message)
+            elif new > old:
+                message = GridTableMessage(self.table, appended, new - old)
+                self.ProcessTableMessage(message)
+        message = GridTableMessage(self.table, GRIDTABLE_REQUEST_VIEW_GET_VALUES)
+        self.ProcessTableMessage(message)
+        self.EndBatch()
+        self.AdjustScrollbars()
+        self.ForceRefresh()
+
+    def GetSelectedCells(self, *args, **kwargs):
+        """
+        Returns the selection as a CellRegion.  Blocks are kept as rectangles
+        until the caller iterates over them or asks for `Cells()`.
+        """
+        region = CellRegion()
+        topleft = self.GetSelectionBlockTopLeft()
+        if topleft:
+            bottomright = self.GetSelectionBlockBottomRight()
+            region = self.CellsByCorners(topleft, bottomright)
+        for row, col in super(Grid, self).GetSelectedCells():
+            region.Add(row, col)
+        if not region:
+            region.Add(*self.GetGridCursorPos())
+        return region
+
+    def GetSelectedValues(self):
+        """
+        Returns the selected values of a virtual grid, block by block.
+        """
+        return self.GetSelectedCells().Values(self.store)
+
+    def GetGridCursorPos(self):
+        return self.GetGridCursorRow(), self.GetGridCursorCol()
+
+    def CellsByCorners(self, toplefts, bottomrights):
+        return CellRegion.FromCorners(toplefts, bottomrights)
+
+
+class NotebookPages(Mapping):
+    """
+    Maps tab names to the Form on each tab of a Notebook, in tab order.
+    Looking up a tab that hasn't been built yet builds it.
+    """
+
+    def __init__(self, notebook):
+        self.notebook = notebook
+
+    def __getitem__(self, tabname):
+        return self.notebook.BuildPage(tabname)
+
+    def __iter__(self):
+        return iter(self.notebook._tabs)
+
+    def __len__(self):
+        return len(self.notebook._tabs)
+
+
+class Notebook(wxPlaceHolder, AuiNotebook):
+    """
+    Each entry in `pages` becomes a tab holding its own Form.  When created
+    with `lazy=True` every tab starts out as an empty panel, and its Form is
+    only built the first time the tab is shown or its page is requested.
+    Values for tabs that haven't been built come from SetValue, or else from
+    the declarations of their fields (see wxPlaceHolder.DeclaredValue).
+    """
+
+    def make(self, parent):
+        # pull pages.
+        self._pdict = self.kwargs.pop("pages", OrderedDict())
+        lazy = self.kwargs.pop("lazy", False)
+        self.pages = NotebookPages(self)
+        self._tabs = []
+        self._forms = dict()
+        self._unbuilt = OrderedDict()
+        self._values = dict()
+        # No name kwarg to Notebooks.
+        self.name = self.kwargs.pop("name")
+        AuiNotebook.__init__(self, parent, **self.kwargs)
+        for key, contents in self._pdict.items():
+            tabname = key[0] if isinstance(key, tuple) else key
+            if lazy:
+                page = wx.Panel(self)
+                self._unbuilt[tabname] = (page, key, contents)
+            else:
+                page = self._forms[tabname] = self._makePage(self, key, contents)
+            self._tabs.append(tabname)
+            self.AddPage(page, tabname)
+        if lazy:
+            self.Bind(EVT_AUINOTEBOOK_PAGE_CHANGED, self.onPageChanged)
+            if self.GetSelection() >= 0:
+                self._buildWindow(self.GetPage(self.GetSelection()))
+        return self
+
+    def _makePage(self, parent, key, contents):
+        from .Form import NotebookPage
+
+        form = NotebookPage(parent, key, contents)
+        for name in form.elements:
+            if name in self._values:
+                form[name] = self._values[name]
+        return form
+
+    def _buildWindow(self, window):
+        for tabname, (page, key, contents) in self._unbuilt.items():
+            if page is window:
+                return self.BuildPage(tabname)
+
+    def onPageChanged(self, evt):
+        evt.Skip()
+        self._buildWindow(self.GetPage(evt.GetSelection()))
+
+    def IsPageBuilt(self, tabname):
+        return tabname in self._forms
+
+    def BuildPage(self, tabname):
+        """
+        Returns the Form for a tab, building it into its placeholder first
+        if that hasn't happened yet.
+        """
+        if tabname in self._forms:
+            return self._forms[tabname]
+        placeholder, key, contents = self._unbuilt.pop(tabname)
+        # Building a Form resizes its parent, the notebook decides the size.
+        size = placeholder.GetSize()
+        form = self._forms[tabname] = self._makePage(placeholder, key, contents)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(form, 1, wx.EXPAND)
+        placeholder.SetSizer(sizer)
+        placeholder.SetSize(size)
+        placeholder.Layout()
+        return form
+
+    def GetValue(self):
+        from .Form import flattenParts
+
+        value = dict()
+        for tabname in self._tabs:
+            if tabname in self._forms:
+                value.update(iter(self._forms[tabname]))
+            else:
+                placeholder, key, contents = self._unbuilt[tabname]
+                shape, leaves = flattenParts(OrderedDict([(key, contents)]))
+                for leaf in leaves:
+                    if not leaf.name:
+                        continue
+                    if leaf.name in self._values:
+                        value[leaf.name] = self._values[leaf.name]
+                    elif isinstance(leaf, Spec):
+                        value[leaf.name] = leaf.control.DeclaredValue(
+                            dict(leaf.options)
+                        )
+                    else:
+                        value[leaf.name] = leaf.DeclaredValue(leaf.kwargs)
+        return value
+
+    def SetValue(self, val):
+        if not val:
+            return
+        self._values.update(val)
+        for form in self._forms.values():
+            for name in form.elements:
+                if name in val:
+                    form[name] = val[name]
+
+
+class ComboTreeBox(wxPlaceHolder, MSWComboTreeBox):
+    def make(self, parent):
+        MSWComboTreeBox.__init__(self, parent, **self.kwargs)
+        return self
+
+    #   def SetValue(self, val):
+    #     super(ComboTreeBox, self).SetValue(val)
+    #     self.element._text.SetInsertionPoint(0)
+
+    #   def Getvalue(self, val):
+    #     pass
+
+    #   def GetClientData(self, selection):
+    #     return self.element.GetClientData(selection)
+
+    def SetOptions(self, choices):
+        for category, options in choices:
+            id = self.Append(category)  # @ReservedAssignment
+            for option in options:
+                self.Append(option, parent=id, clientData=category)
+            if self.expand:
+                self.GetTree().Expand(id)
+
+
+class FloatSpin(wxPlaceHolder, FloatSpin_):
+    changeEvents = (EVT_FLOATSPIN,)
+    emptyValue = 0.0
+
+    def make(self, parent):
+        FloatSpin_.__init__(self, parent, **self.kwargs)
+        return self
+
+
+class IpAddrCtrl(wxPlaceHolder, IpAddrCtrl_):
+    changeEvents = (wx.EVT_TEXT,)
+
+    def make(self, parent):
+        IpAddrCtrl_.__init__(self, parent, **self.kwargs)
+        return self
+
+
+class CheckTreeCtrl(wxPlaceHolder, CustomTreeCtrl_):
+    """
+    Check states are mirrored in `checked` as items are checked, so GetValue
+    is a copy of that map and SetValue only touches items whose state has to
+    change.  Options are populated in a single Freeze/Thaw.  `version` counts
+    the changes to the check states.
+    """
+
+    changeEvents = (EVT_TREE_ITEM_CHECKED,)
+
+    def make(self, parent):
+        CustomTreeCtrl_.__init__(self, parent, **self.kwargs)
+        self.byname = {}
+        self.checked = {}
+        self._byitem = {}
+        self.version = 0
+        self.Bind(EVT_TREE_ITEM_CHECKED, self.onItemChecked)
+        return self
+
+    def SetOptions(self, options):
+        self.byname = {}
+        self.checked = {}
+        self._byitem = {}
+        self.version += 1
+        self.Freeze()
+        try:
+            # CustomTreeCtrl only allows a single root.
+            self.DeleteAllItems()
+            root = self.AddRoot("")
+            for parent, children in options:
+                parentid = self.AppendItem(root, parent)
+                self._byitem[parentid] = (parent, None)
+                self.byname[parent] = {}
+                self.checked[parent] = {}
+                for child in children:
+                    childid = self.AppendItem(parentid, child, ct_type=1)
+                    self._byitem[childid] = (parent, child)
+                    self.byname[parent][child] = childid
+                    self.checked[parent][child] = self.IsItemChecked(childid)
+            self.ExpandAll()
+        finally:
+            self.Thaw()
+
+    def onItemChecked(self, evt):
+        evt.Skip()
+        self.version += 1
+        parent, child = self._byitem.get(evt.GetItem(), (None, None))
+        if child is not None:
+            self.checked[parent][child] = self.IsItemChecked(evt.GetItem())
+        elif parent is not None:
+            # Checking a parent may cascade to its children.
+            for child, item in self.byname[parent].items():
+                self.checked[parent][child] = self.IsItemChecked(item)
+
+    def GetValue(self):
+        return {parent: dict(children) for parent, children in self.checked.items()}
+
+    def ValueStamp(self):
+        return self.version
+
+    def SetValue(self, val):
+        self.Freeze()
+        try:
+            for parent, children in self.byname.items():
+                state = self.checked[parent]
+                for child, item in children.items():
+                    try:
+                        checked = bool(val[parent][child])
+                    except KeyError:
+                        # Assume missing keys are for newly added entries.  Default to true.
+                        checked = True
+                    if state[child] != checked:
+                        self.CheckItem(item, checked)
+                        state[child] = checked
+                        self.version += 1
+        finally:
+            self.Thaw()
+
+
+class HyperlinkCtrl(wxPlaceHolder, HyperLinkCtrl_):
+    def make(self, parent):
+        HyperLinkCtrl_.__init__(parent, -1, **self.kwargs)
+        return self
+
+    def GetValue(self):
+        return self.GetURL()
+
+    def SetValue(self, val):
+        self.SetURL(val)
+
+    def SetLabel(self, label):
+        self.SetLabel(label)
+
+
+class Console(wxPlaceHolder):
+    def make(self, parent):
+        self.element = Shell(parent=parent)
+        return self.element
+
+
+class DatePickerCtrl(wxPlaceHolder, DatePickerCtrl_):
+    changeEvents = (EVT_DATE_CHANGED,)
+
+    def make(self, parent):
+        DatePickerCtrl_.__init__(self, parent, **self.kwargs)
+        return self
+
+
+class NumCtrl(wxPlaceHolder, NumCtrl_):
+    changeEvents = (EVT_NUM,)
+    emptyValue = 0
+
+    def make(self, parent):
+        NumCtrl_.__init__(self, parent, **self.kwargs)
+        return self
@@ -1,17 +1,38 @@
 # !/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import weakref
 from collections import OrderedDict, defaultdict
+from collections.abc import Mapping
+from copy import copy, deepcopy
+from time import perf_counter
 from traceback import print_exc
 
 import wx
 from wx import EVT_MENU
 from wx.lib.scrolledpanel import ScrolledPanel
 
-from .Controls import CheckBox, RadioButton, Row, StaticText
+from .Controls import CheckBox, RadioButton, Row, Spec, StaticText
+from .Loading import DEFAULTS, OPTIONS, AsyncLoader
+from .Stats import BuildStats
+from .Translate import PASSTHROUGH, compileTranslations, translateRecords
+from .Validation import ValidationEngine
 
 
 class FormDialog(wx.Dialog):
+    """
+    A dialog holding a single Form.  Pooled dialogs (`pooled=True`) are hidden
+    rather than destroyed when they close, and `open` shows one of them again
+    instead of building a new one.  Hidden dialogs are pooled per panel class,
+    at most `poolSize` per class and `poolLimit` in all, dropping the least
+    recently used ones first.
+    """
+
+    # Hidden dialogs by panel class, least recently used class first.
+    _pool = OrderedDict()
+    poolSize = 4
+    poolLimit = 16
+
     def __init__(
         self,
         parent,
@@ -22,8 +43,12 @@ class FormDialog(wx.Dialog):
         offset=None,
         gap=3,
         position=None,
+        pooled=False,
+        values=None,
         **kwargs,
     ):
+        self.pooled = pooled
+        self.panelClass = panel
         wx.Dialog.__init__(
             self, parent, -1, title, style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER
         )
@@ -66,31 +91,180 @@ class FormDialog(wx.Dialog):
             ds.AddGrowableRow(0)
 
             self.SetSizerAndFit(ds)
-            if position is None:
-                self.Center()
-            else:
-                self.SetPosition(position)
+            self.place(position, offset)
 
-            if offset:
-                newpos = map(lambda x: x + offset, self.GetPosition())
-                self.SetPosition(wx.Point(*newpos))
+            if pooled:
+                # What the fields held when the dialog was built, for reset,
+                # copied since virtual controls return their live data.  The
+                # defaults as declared tell later (loaded) defaults apart.
+                self.initial = OrderedDict(
+                    (name, copyValue(value))
+                    for name, value in self.panel.get_values().values.items()
+                )
+                self.declared = dict(self.panel.form["Defaults"])
+            if values:
+                self.panel.mark_clean(values=self.panel.set_values(values).values)
+            self.present(modal)
+
+    @classmethod
+    def open(cls, parent, panel, values=None, modal=False, **kwargs):
+        """
+        Shows a pooled dialog for `panel`.  A hidden one is reused when the
+        pool has one for the same parent, reset to its defaults and then to
+        `values`.  Otherwise a new pooled dialog is built.
+        """
+        dialog = cls._acquire(parent, panel)
+        if dialog is None:
+            return cls(parent, panel, modal=modal, pooled=True, values=values, **kwargs)
+        if "title" in kwargs:
+            dialog.SetTitle(kwargs["title"])
+        dialog.reset(values)
+        dialog.place(kwargs.get("position"), kwargs.get("offset"))
+        dialog.present(modal)
+        return dialog
 
-            for wrapper in self.panel.elements.values():
-                if not isinstance(wrapper, (RadioButton, CheckBox, StaticText)):
-                    wrapper.SetFocus()
-                    break
+    @classmethod
+    def _acquire(cls, parent, panel):
+        dialogs = cls._pool.get(panel, [])
+        # Dialogs destroyed along with their parent are falsy.
+        dialogs[:] = [dialog for dialog in dialogs if dialog]
+        for dialog in reversed(dialogs):
+            if dialog.GetParent() is parent:
+                dialogs.remove(dialog)
+                return dialog
+        return None
 
-            if modal:
-                self.res = self.ShowModal()
-            else:
-                self.Show()
+    def release(self):
+        """
+        Hides the dialog and returns it to the pool, destroying the least
+        recently used dialogs when the pool is full.
+        """
+        self.Hide()
+        pool = self._pool
+        dialogs = pool.pop(self.panelClass, [])
+        pool[self.panelClass] = dialogs
+        dialogs.append(self)
+        while len(dialogs) > self.poolSize:
+            dialogs.pop(0).Destroy()
+        while sum(map(len, pool.values())) > self.poolLimit:
+            oldest = next(iter(pool))
+            pool[oldest].pop(0).Destroy()
+            if not pool[oldest]:
+                del pool[oldest]
+
+    def reset(self, values=None):
+        """
+        Puts every field back the way it was built, or to its default when one
+        was loaded since, and then applies `values`.  The result becomes the
+        baseline for dirty_fields.
+        """
+        panel = self.panel
+        fields = OrderedDict(
+            (name, copyValue(value)) for name, value in self.initial.items()
+        )
+        missing = object()
+        for name, value in panel.form["Defaults"].items():
+            if name in fields and value is not self.declared.get(name, missing):
+                fields[name] = value
+        fields.update(values or {})
+        report = panel.set_values(fields)
+        panel.mark_clean(values=report.values)
+        return report
+
+    def place(self, position=None, offset=None):
+        if position is None:
+            self.Center()
+        else:
+            self.SetPosition(position)
+
+        if offset:
+            newpos = map(lambda x: x + offset, self.GetPosition())
+            self.SetPosition(wx.Point(*newpos))
+
+    def present(self, modal=False):
+        for wrapper in self.panel.elements.values():
+            if not isinstance(wrapper, (RadioButton, CheckBox, StaticText)):
+                wrapper.SetFocus()
+                break
+
+        if modal:
+            self.res = self.ShowModal()
+        else:
+            self.Show()
 
     def FocusNext(self):
         for child in reversed(wx.GetTopLevelWindows()[0].GetChildren()):
-            if isinstance(child, FormDialog) and child is not self:
+            if isinstance(child, FormDialog) and child is not self and child.IsShown():
                 child.Raise()
                 break
-        self.Destroy()
+        if self.pooled:
+            self.release()
+        else:
+            self.Destroy()
+
+
+def copyValue(value):
+    """
+    A deep copy of a field value, or the value itself when it can't be
+    copied (some wx objects, a wx.DateTime for instance).
+    """
+    try:
+        return deepcopy(value)
+    except Exception:
+        return value
+
+
+def snapshot(value):
+    """
+    A shallow copy of the plain containers a caller might go on changing.
+    Live data (virtual controls) is tracked by ValueStamp instead.
+    """
+    if isinstance(value, (list, dict, set, bytearray)):
+        return copy(value)
+    return value
+
+
+def sameValue(old, new):
+    # A list written to a control may well be read back as a tuple.
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        return len(old) == len(new) and all(map(sameValue, old, new))
+    try:
+        return bool(old == new)
+    except (ValueError, TypeError):
+        pass
+    # NumPy columns, or mappings of them, compare element-wise.
+    if isinstance(old, Mapping) or isinstance(new, Mapping):
+        return (
+            isinstance(old, Mapping)
+            and isinstance(new, Mapping)
+            and old.keys() == new.keys()
+            and all(sameValue(old[key], new[key]) for key in old)
+        )
+    if not (hasattr(old, "__len__") and hasattr(new, "__len__")):
+        return False
+    try:
+        return len(old) == len(new) and bool((old == new).all())
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
+class FieldReport(object):
+    """
+    The outcome of a bulk read or write of form values.  `values` maps field
+    names to the values read or written, `errors` maps the names of fields
+    that failed to the exception they raised.  A report is truthy when
+    nothing failed.
+    """
+
+    def __init__(self):
+        self.values = OrderedDict()
+        self.errors = OrderedDict()
+
+    def __bool__(self):
+        return not self.errors
+
+    def __repr__(self):
+        return f"FieldReport(values={len(self.values)}, errors={list(self.errors)})"
 
 
 class Form(wx.Panel):
@@ -102,6 +276,17 @@ class Form(wx.Panel):
     S = SCROLLED = 8
     VC = VERTICAL_ENTER = wx.EXPAND | wx.ALL
 
+    # Compiled BuildPlans, keyed by Form subclass and declaration shape.
+    _plans = {}
+    # Plans for shared Spec templates, keyed by Form subclass and template.
+    # Templates are only weakly referenced and dropped once they're gone.
+    _templates = {}
+    cachePlan = True
+    # Build plans with redundant sizers merged away (see optimizePlan).
+    flattenSizers = True
+    # Record a BuildStats in build_stats whenever the form is built.
+    collectStats = False
+
     def __init__(
         self, parent=None, id=-1, gap=3, sizes=(-1, -1), *args
     ):  # @ReservedAssignment
@@ -111,6 +296,19 @@ class Form(wx.Panel):
         self.gap = gap
         self.elements = OrderedDict([])
         self.ATables = defaultdict(list)
+        self.translators = {}
+        # Each field's value as of the last mark_clean (or its ValueStamp, for
+        # controls that have one), and the fields that have changed since,
+        # which may or may not differ from it.
+        self.baseline = {}
+        self.stamps = {}
+        self.touched = set()
+        # Called with a field's name whenever its value changes.
+        self.changeListeners = [self.touched.add]
+        self.validation = None
+        # Resolved once asynchronously loaded data has been applied.
+        self.ready = None
+        self.build_stats = None
 
         if hasattr(self, "form"):
             # Before building verify that several required sections exist in the form
@@ -119,16 +317,19 @@ class Form(wx.Panel):
             self.form["Validators"] = self.form.get("Validators", {})
             self.form["Options"] = self.form.get("Options", {})
             self.form["Disabled"] = self.form.get("Disabled", [])
+            self.validation = ValidationEngine(self)
 
             # Allow subclasses to add their own values or defaults.
             self.loadDefaults()
             self.loadOptions()
+            self.compileTranslations()
             self.build()
             if sizes == (-1, -1):
                 self.Parent.SetSize(self.Parent.GetBestVirtualSize())
             if "Title" in self.form and hasattr(parent, "SetTitle"):
                 parent.SetTitle(self.form["Title"])
             self.bind()
+            self.loadAsync()
 
     def __iter__(self):
         return ((k, self[k]) for k in self.elements.keys())
@@ -141,26 +342,161 @@ class Form(wx.Panel):
 
     def __setitem__(self, key, value=""):
         try:
-            return self.elements[key].SetValue(self.m2h(key, value))
+            result = self.elements[key].SetValue(self.m2h(key, value))
+            self.fieldChanged(key)
+            return result
         except:
             print_exc()
 
+    def get_values(self, names=None):
+        """
+        Reads several fields (all of them by default) at once.  Raw values are
+        read first and translated afterwards.  Returns a FieldReport; fields
+        that couldn't be read end up in its errors rather than being skipped
+        silently.
+        """
+        report = FieldReport()
+        raw = []
+        for name in self.elements if names is None else names:
+            try:
+                raw.append((name, self.elements[name].GetValue()))
+            except Exception as e:
+                report.errors[name] = e
+        translators = self.translators
+        for name, value in raw:
+            try:
+                translator = translators.get(name)
+                if translator is not None:
+                    value = translator[1](value)
+                report.values[name] = value
+            except Exception as e:
+                report.errors[name] = e
+        return report
+
+    def set_values(self, values):
+        """
+        Writes a mapping of field values inside a single Freeze/Thaw, laying
+        the form out once at the end.  Returns a FieldReport of the values
+        written and the fields that failed.
+        """
+        report = FieldReport()
+        self.Freeze()
+        try:
+            for name, value in values.items():
+                try:
+                    self.elements[name].SetValue(self.m2h(name, value))
+                    report.values[name] = value
+                    self.fieldChanged(name)
+                except Exception as e:
+                    report.errors[name] = e
+        finally:
+            self.Layout()
+            self.Thaw()
+        return report
+
+    def changes(self):
+        """
+        Reads the fields that changed since the baseline was recorded and
+        returns a FieldReport of those whose value now differs from it.  Only
+        fields that were written or fired a change event are read; the ones
+        found unchanged stop being tracked until they change again.
+        """
+        touched = []
+        for name in self.elements:
+            if name not in self.touched:
+                continue
+            if name in self.stamps:
+                if self.stamps[name] == self.elements[name].ValueStamp():
+                    self.touched.discard(name)
+                    continue
+            touched.append(name)
+        report = self.get_values(touched)
+        for name, value in list(report.values.items()):
+            if name in self.baseline and sameValue(self.baseline[name], value):
+                del report.values[name]
+                self.touched.discard(name)
+        return report
+
+    def dirty_fields(self):
+        """
+        The names of the fields whose value differs from the baseline.
+        """
+        return list(self.changes().values)
+
+    def mark_clean(self, names=None, values=None):
+        """
+        Makes the current values of the fields in `names` the baseline,
+        typically after saving them.  Only the fields that changed are read
+        by default, the others still hold their baseline value.  Pass the
+        `values` that were just written (or saved) to use them instead of
+        reading the fields back.
+        """
+        if values is None:
+            if names is None:
+                names = list(self.touched)
+            stamped = [name for name in names if self.setStamp(name)]
+            values = self.get_values(
+                [name for name in names if name not in stamped]
+            ).values
+        for name, value in values.items():
+            if not self.setStamp(name):
+                self.baseline[name] = snapshot(value)
+            self.touched.discard(name)
+
+    def setStamp(self, name):
+        """
+        Records the ValueStamp of a field as its baseline.  Returns False for
+        fields without one.
+        """
+        stamp = self.elements[name].ValueStamp()
+        if stamp is None:
+            return False
+        self.stamps[name] = stamp
+        self.baseline.pop(name, None)
+        self.touched.discard(name)
+        return True
+
+    def compileTranslations(self):
+        """
+        Compiles form["Translations"] into a Translator pair per field.  This
+        happens before the form is built; call it again after changing the
+        translations of a built form.  form["TranslationMode"] sets how values
+        missing from the tables are handled (see the Translate module).
+        """
+        self.translators = compileTranslations(
+            self.form.get("Translations", {}),
+            self.form.get("TranslationMode", PASSTHROUGH),
+        )
+
     def HumanToMachine(self, name, value=""):
-        if "Translations" in self.form:
-            if name in self.form["Translations"]:
-                value = self.form["Translations"][name][1].get(value, value)
-        return value
+        translator = self.translators.get(name)
+        return value if translator is None else translator[1](value)
 
     h2m = HumanToMachine
 
     def MachineToHuman(self, name, value=""):
-        if "Translations" in self.form:
-            if name in self.form["Translations"]:
-                value = self.form["Translations"][name][0].get(value, value)
-        return value
+        translator = self.translators.get(name)
+        return value if translator is None else translator[0](value)
 
     m2h = MachineToHuman
 
+    def translateColumn(self, name, values, toHuman=False):
+        """
+        Translates a whole column of values for one field in a single call.
+        """
+        translator = self.translators.get(name)
+        if translator is None:
+            return list(values)
+        return translator[0 if toHuman else 1].column(values)
+
+    def translateRecords(self, records, toHuman=False):
+        """
+        Translates a batch of records (mappings of field name to value),
+        returning new records.  Human values are turned into machine values,
+        or the other way around when `toHuman` is set.
+        """
+        return translateRecords(self.translators, records, toHuman)
+
     def Bind(self, evtType, evtFunc, evtSrc=None, call=False, *args, **kwargs):
         """
         I rewrote Bind a little bit to simplify binding events using the names
@@ -170,13 +506,42 @@ class Form(wx.Panel):
         """
         if evtSrc:
             if isinstance(evtSrc, str):
-                evtSrc = self.elements[evtSrc]
+                name, evtSrc = evtSrc, self.elements[evtSrc]
+                if evtType in evtSrc.changeEvents:
+                    evtFunc = self.tracked(name, evtFunc)
             evtSrc.Bind(evtType, evtFunc)
         else:
             super().Bind(evtType, evtFunc)
         if call:
             evtFunc()
 
+    def tracked(self, name, evtFunc):
+        """
+        Wraps a handler for one of a field's change events so the change is
+        still tracked when the handler doesn't Skip the event.
+        """
+
+        def handler(*args):
+            self.fieldChanged(name)
+            return evtFunc(*args)
+
+        return handler
+
+    def onFieldChange(self, evt, name):
+        evt.Skip()
+        self.fieldChanged(name)
+
+    def fieldChanged(self, name):
+        for listener in self.changeListeners:
+            listener(name)
+
+    def fieldValidated(self, name, success, messages):
+        """
+        Called on the UI thread as each field's validation finishes, for
+        forms that want to flag invalid fields while the user types.
+        """
+        pass
+
     def Accel(self, key, func, elem, kind=wx.ACCEL_NORMAL):
         """
         This convenience function is provided to simplify Accelerator Table
@@ -189,14 +554,161 @@ class Form(wx.Panel):
     def build(self):
         """
         The Build Method automates sizer creation and element placement by parsing
-        a properly constructed object.
+        a properly constructed object.  The declaration is compiled into a
+        BuildPlan once per Form subclass and replayed on later builds.  Forms
+        that override one of the parse methods are walked the old fashioned way.
+        With `collectStats` set the build is timed and measured (see the Stats
+        module) and the result kept in `build_stats`.
         """
+        stats = None
+        if self.collectStats:
+            stats = self.build_stats = BuildStats(type(self).__name__)
+            start = perf_counter()
 
         # The Main Sizer for the Panel.
         panelSizer = wx.BoxSizer(wx.VERTICAL)
-        # Pass the outermost Parts and the container to the OrderedDict Parser.
-        self.parseContainer(self.form["Parts"], panelSizer)
-        self.SetSizerAndFit(panelSizer)
+        if self.cachePlan and not self.walksParts():
+            plan, leaves = self.getPlan(self.form["Parts"])
+            self.replayPlan(plan, leaves, panelSizer)
+        elif stats is None:
+            # Pass the outermost Parts and the container to the OrderedDict Parser.
+            self.parseContainer(self.form["Parts"], panelSizer)
+        else:
+            stats.path = "walk"
+            for name in PARSERS + ("makeWidget",):
+                setattr(self, name, stats.timed(name, getattr(self, name)))
+            try:
+                self.parseContainer(self.form["Parts"], panelSizer)
+            finally:
+                for name in PARSERS + ("makeWidget",):
+                    del self.__dict__[name]
+
+        if stats is None:
+            self.SetSizerAndFit(panelSizer)
+        else:
+            fit = perf_counter()
+            self.SetSizerAndFit(panelSizer)
+            stats.add("SetSizerAndFit", perf_counter() - fit)
+            stats.total = perf_counter() - start
+            stats.measure(panelSizer, self.elements.values())
+            stats.log()
+
+    def walksParts(self):
+        """
+        Subclasses that customize any of the parse methods can't be replayed
+        from a plan, since the plan skips those methods entirely.
+        """
+        cls = type(self)
+        return any(getattr(cls, name) is not getattr(Form, name) for name in PARSERS)
+
+    def getPlan(self, parts):
+        """
+        Returns the cached BuildPlan for this Form subclass, along with the
+        declarators it should be replayed with.  Plans are keyed on the shape
+        of the declaration, including the layout properties of its fields
+        (proportion, span, etc.), so forms that build different structures
+        per instance get a plan for each structure.
+
+        Specs can't change between builds, but the containers holding them
+        can.  So when the same template object is built again, and it still
+        holds the same Specs in the same places, even the walk for its
+        declarators and their layout properties is skipped.
+        """
+        template = Form._templates.get((type(self), id(parts)))
+        if (
+            template is not None
+            and template[0]() is parts
+            and template[3] == partsContents(parts)
+        ):
+            return template[1], template[2]
+        shape, leaves = flattenParts(parts)
+        key = (type(self), shape)
+        plan = Form._plans.get(key)
+        if plan is None:
+            plan, leaves = compilePlan(parts)
+            if self.flattenSizers:
+                plan = optimizePlan(plan)
+            Form._plans[key] = plan
+        if all(isinstance(leaf, Spec) for leaf in leaves):
+            self.keepTemplate(parts, plan, leaves)
+        return plan, leaves
+
+    def keepTemplate(self, parts, plan, leaves):
+        key = (type(self), id(parts))
+
+        def forget(ref):
+            if Form._templates.get(key, (None,))[0] is ref:
+                del Form._templates[key]
+
+        try:
+            ref = weakref.ref(parts, forget)
+        except TypeError:
+            # Plain dicts can't be weakly referenced, they just aren't kept.
+            return
+        Form._templates[key] = (ref, plan, leaves, partsContents(parts))
+
+    def replayPlan(self, plan, leaves, outerSizer):
+        """
+        Creates the sizers and widgets described by a BuildPlan.  Sizers and
+        widgets are pushed onto a stack as they are created and popped off
+        again when they are added to the sizer beneath them.
+        """
+        gap = self.gap
+        stack = [outerSizer]
+        parents = [None]
+        stats = self.build_stats if self.collectStats else None
+        if stats is not None:
+            stats.path = "plan"
+        for op in plan.ops:
+            code = op[0]
+            if stats is not None:
+                start = perf_counter()
+            if code is WIDGET:
+                stack.append(self.makeWidget(leaves[op[1]], parents[-1]))
+            elif code is ADD:
+                item = stack.pop()
+                stack[-1].Add(item, op[1], flag=op[2], border=gap * op[3])
+            elif code is PLACE:
+                item = stack.pop()
+                stack[-1].Add(item, op[1], op[2], border=gap, flag=op[3])
+            elif code is BOX:
+                stack.append(wx.BoxSizer(op[1]))
+            elif code is GRID:
+                stack.append(wx.GridBagSizer(0, 0))
+            elif code is FLEX:
+                stack.append(wx.FlexGridSizer(op[1], 0, 0))
+            elif code is SECTION:
+                display, flags = op[1], op[2]
+                self.flags = flags
+                if flags & Form.NC:
+                    sizer = wx.BoxSizer(wx.VERTICAL)
+                else:
+                    box = wx.StaticBox(parents[-1] or self, -1, display)
+                    sizer = wx.StaticBoxSizer(box, wx.VERTICAL)
+                stack.append(sizer)
+                if flags & Form.S:
+                    parent = ScrolledPanel(self, -1)
+                    sizer.Add(parent, 1, flag=Form.VC, border=gap)
+                    parents.append(parent)
+                    stack.append(wx.BoxSizer(wx.VERTICAL))
+            elif code is END_SECTION:
+                if op[1] & Form.S:
+                    parent = parents.pop()
+                    parent.SetupScrolling()
+                    parent.SetSizer(stack.pop())
+            elif code is GROW:
+                stack[-1].AddGrowableRow(op[1])
+                stack[-1].AddGrowableCol(op[2])
+            elif code is GROW_ROW:
+                sizer = stack[-1]
+                if op[1] < sizer.GetRows() and not sizer.IsRowGrowable(op[1]):
+                    sizer.AddGrowableRow(op[1])
+            elif code is GROW_COL:
+                sizer = stack[-1]
+                if op[1] < sizer.GetCols() and not sizer.IsColGrowable(op[1]):
+                    sizer.AddGrowableCol(op[1])
+            if stats is not None:
+                stats.add(PHASES.get(code, code), perf_counter() - start)
 
     def bind(self):
         # Attempt to accommodate non-dialog parents.
@@ -341,8 +853,11 @@ class Form(wx.Panel):
           SetValue
           SetValidator
           SetOptions
+        Specs are turned into a fresh declarator before being made.
         """
 
+        if isinstance(declarator, Spec):
+            declarator = declarator.create()
         # Attach the elements container to the declarator.
         declarator._elements = self.elements
         element = declarator.make(parent or self)
@@ -354,12 +869,22 @@ class Form(wx.Panel):
             # Options need to exist early.
             if hasattr(declarator, "SetOptions"):
                 declarator.SetOptions(self.form["Options"].get(declarator.name, []))
-            # We need to use the existing value if there isn't one in defaults
-            # to prevent StaticText's from ending up blank.
-            value = self.form["Defaults"].get(declarator.name, declarator.GetValue())
-            # Assign or populate any fields requiring it.
-            declarator.SetValue(self.m2h(declarator.name, value))
+            # Assign or populate any fields requiring it.  Fields without a
+            # default keep the value they were made with (a StaticText's
+            # label, say), which isn't a machine value to translate.
+            defaults = self.form["Defaults"]
+            if declarator.name in defaults:
+                value = defaults[declarator.name]
+                declarator.SetValue(self.m2h(declarator.name, value))
+                self.mark_clean(values={declarator.name: value})
+            else:
+                self.mark_clean([declarator.name])
             declarator.SetValidator(self.form["Validators"].get(declarator.name, None))
+            for event in declarator.changeEvents:
+                element.Bind(
+                    event,
+                    lambda evt, name=declarator.name: self.onFieldChange(evt, name),
+                )
         return element
 
     def loadDefaults(self):
@@ -368,6 +893,54 @@ class Form(wx.Panel):
     def loadOptions(self):
         pass
 
+    def loadDefaultsAsync(self):
+        """
+        Override to load defaults without blocking the UI.  Called on a worker
+        thread once the form is built; return a mapping or yield (name, value)
+        pairs (see the Loading module).
+        """
+        pass
+
+    def loadOptionsAsync(self):
+        """
+        The asynchronous counterpart of loadOptions, see loadDefaultsAsync.
+        """
+        pass
+
+    def loadAsync(self):
+        """
+        Starts the asynchronous loaders the subclass provides.  The fields named
+        in form["Loading"] (every input field by default) are busy until their
+        data arrives.  `ready` is resolved with the form once it's all applied;
+        it's resolved on the UI thread, so wait for it there with whenReady.
+        """
+        sources = [
+            (kind, getattr(self, method))
+            for kind, method in (
+                (DEFAULTS, "loadDefaultsAsync"),
+                (OPTIONS, "loadOptionsAsync"),
+            )
+            if getattr(type(self), method) is not getattr(Form, method)
+        ]
+        busy = self.form.get("Loading")
+        if busy is None and sources:
+            busy = [name for name, field in self.elements.items() if field.changeEvents]
+        self.loader = AsyncLoader(self, sources, busy or ())
+        self.ready = self.loader.ready
+
+    def whenReady(self, callback):
+        """
+        Calls `callback` with the `ready` future on the UI thread once the
+        asynchronously loaded data has been applied.
+        """
+        self.loader.whenReady(callback)
+
+    def onLoaded(self):
+        """
+        Called on the UI thread once the asynchronous loaders are done.
+        """
+        pass
+
     def onOk(self, evt):
         evt.Skip()
         self.onClose(evt)
@@ -378,21 +951,349 @@ class Form(wx.Panel):
             self.Parent.FocusNext()
 
     def fieldValidate(self):
+        """
+        Validates the form before it's submitted.  Fields that haven't changed
+        since they were last validated keep their result, so this only waits
+        for fields that are dirty or still being validated.
+        """
         if "Validators" not in self.form:
             return True
-        success, messages = True, []
-        for name, field in self.elements.items():
-            if name in self.form["Validators"]:
-                s, m = field.Validate()
-                if not s:
-                    success = False
-                    messages.extend(m)
+        success, messages = self.validation.wait()
         if messages:
             text = "\r\n".join(messages)
             wx.MessageDialog(self, text, "Form Field Error", wx.OK).ShowModal()
         return success
 
 
+class NotebookPage(Form):
+    """
+    The Form shown on a single Notebook tab.  The tab's contents become the
+    only section of the form.
+    """
+
+    def __init__(self, parent, key, contents, gap=1):
+        self.form = dict(Parts=OrderedDict([(key, contents)]))
+        super(NotebookPage, self).__init__(parent, gap=gap)
+
+
+# BuildPlan operations.  Each op is a tuple starting with one of these codes.
+# ADD carries the number of gaps in its border, which is more than one where
+# sizers have been merged.
+BOX = "box"
+GRID = "grid"
+FLEX = "flex"
+SECTION = "section"
+END_SECTION = "end_section"
+WIDGET = "widget"
+ADD = "add"
+PLACE = "place"
+GROW = "grow"
+GROW_ROW = "grow_row"
+GROW_COL = "grow_col"
+
+# The Form methods a BuildPlan stands in for.
+PARSERS = ("parseContainer", "parseSection", "parseBlock", "makeRow", "makeGrid")
+# Build stats phases for plan operations, the rest are reported by op code.
+PHASES = {
+    WIDGET: "makeWidget",
+    GRID: "makeGrid",
+    FLEX: "makeGrid",
+    SECTION: "parseSection",
+}
+
+
+class BuildPlan(object):
+    """
+    A flattened, immutable description of the sizers and widgets a form
+    declaration produces.  `ops` is a tuple of operations replayed by
+    Form.replayPlan, `shape` is the structural key the plan was compiled
+    for and `size` is the number of declarators the plan expects.
+    """
+
+    __slots__ = ("ops", "shape", "size")
+
+    def __init__(self, ops, shape, size):
+        object.__setattr__(self, "ops", tuple(ops))
+        object.__setattr__(self, "shape", shape)
+        object.__setattr__(self, "size", size)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BuildPlan is immutable.")
+
+    def __len__(self):
+        return len(self.ops)
+
+
+def partsContents(parts):
+    """
+    The structure of a declaration made of Specs, with the Specs themselves
+    in place, to tell whether a template was edited after its plan was kept.
+    Comparing it with an unchanged template only compares Specs by identity.
+    """
+    if isinstance(parts, Spec):
+        return parts
+    if isinstance(parts, OrderedDict):
+        return (OrderedDict,) + tuple(
+            (key, partsContents(blocks)) for key, blocks in parts.items()
+        )
+    if isinstance(parts, Row):
+        return (Row, _layout(parts)) + tuple(map(partsContents, parts))
+    if isinstance(parts, (list, tuple)):
+        return (type(parts),) + tuple(map(partsContents, parts))
+    return parts
+
+
+def flattenParts(parts):
+    """
+    Walks a declaration in build order and returns its shape along with the
+    declarators (leaves) it contains.  The shape records the structure of
+    the declaration and the layout properties of its rows and fields, which
+    is everything the plan compiled from it depends on.
+    """
+    shape, leaves = [], []
+    _flattenContainer(parts, shape, leaves)
+    return tuple(shape), leaves
+
+
+# The declarator attributes compilePlan reads.
+SHAPE_ATTRS = (
+    "proportion",
+    "flags",
+    "span",
+    "rowpos",
+    "colpos",
+    "rowGrowable",
+    "colGrowable",
+)
+
+
+def _layout(field):
+    return tuple(getattr(field, attr, None) for attr in SHAPE_ATTRS)
+
+
+def _flattenContainer(container, shape, leaves):
+    shape += (OrderedDict, len(container))
+    for key, blocks in container.items():
+        shape += (key, len(blocks))
+        for block in blocks:
+            _flattenBlock(block, shape, leaves)
+
+
+def _flattenBlock(block, shape, leaves):
+    if isinstance(block, OrderedDict):
+        _flattenContainer(block, shape, leaves)
+    elif isinstance(block, list):
+        shape += (list, len(block))
+        for fields in block:
+            fields = tuple(fields)
+            shape += (tuple, len(fields))
+            for field in fields:
+                shape.append(_layout(field))
+                if isinstance(field, OrderedDict):
+                    _flattenContainer(field, shape, leaves)
+                else:
+                    shape.append(type(field))
+                    leaves.append(field)
+    elif isinstance(block, (tuple, Row)):
+        fields = tuple(block)
+        shape += (type(block), len(fields), _layout(block))
+        for field in fields:
+            _flattenBlock(field, shape, leaves)
+    else:
+        shape += (type(block), _layout(block))
+        leaves.append(block)
+
+
+def compilePlan(parts):
+    """
+    Compiles a declaration into a BuildPlan, following the same rules as
+    Form.parseContainer and friends.  Returns the plan along with the
+    declarators it was compiled from.
+    """
+    ops, leaves = [], []
+    _compileContainer(parts, ops, leaves)
+    shape, _ = flattenParts(parts)
+    return BuildPlan(ops, shape, len(leaves)), leaves
+
+
+def _compileContainer(container, ops, leaves, pos=None, span=None):
+    ops.append((BOX, wx.VERTICAL))
+    proportion = 0
+    for section in container.items():
+        proportion = _compileSection(section, ops, leaves)
+        ops.append((ADD, proportion, Form.VC, 1))
+    if pos is None:
+        ops.append((ADD, 1, Form.VC, 1))
+    else:
+        ops.append((PLACE, pos, span, wx.ALIGN_CENTER_VERTICAL))
+        if proportion:
+            ops.append((GROW,) + pos)
+
+
+def _compileSection(section, ops, leaves):
+    container, blocks = section
+    if isinstance(container, tuple):
+        display, flags = container
+    else:
+        flags, display = Form.D, container
+    ops.append((SECTION, display, flags))
+    for block in blocks:
+        _compileBlock(block, ops, leaves)
+    ops.append((END_SECTION, flags))
+    return 1 if flags & Form.G else 0
+
+
+def _compileBlock(block, ops, leaves):
+    proportion = 0
+    if isinstance(block, OrderedDict):
+        return _compileContainer(block, ops, leaves)
+    if isinstance(block, list):
+        _compileGrid(block, ops, leaves)
+    elif isinstance(block, (tuple, Row)):
+        proportion = getattr(block, "proportion", proportion)
+        ops.append((BOX, wx.HORIZONTAL))
+        for field in block:
+            _compileBlock(field, ops, leaves)
+    else:
+        proportion = block.proportion
+        ops.append((WIDGET, len(leaves)))
+        leaves.append(block)
+    ops.append((ADD, proportion, Form.VC, 1))
+
+
+def _compileGrid(rows, ops, leaves):
+    ops.append((GRID,))
+    for row, fields in enumerate(rows):
+        for col, field in enumerate(fields):
+            flags = getattr(field, "flags", wx.ALL)
+            rowGrowable = getattr(field, "rowGrowable", False)
+            colGrowable = getattr(field, "colGrowable", True)
+            span = getattr(field, "span", (1, 1))
+            pos = (
+                getattr(field, "rowpos", row) or row,
+                getattr(field, "colpos", col) or col,
+            )
+            if isinstance(field, OrderedDict):
+                _compileContainer(field, ops, leaves, pos, span)
+            else:
+                ops.append((WIDGET, len(leaves)))
+                leaves.append(field)
+                ops.append((PLACE, pos, span, wx.ALIGN_CENTER_VERTICAL | flags))
+            # Requested after every field, like makeGrid does: a row or column
+            # only becomes growable once the grid has it, which the replay
+            # checks.
+            if rowGrowable:
+                ops.append((GROW_ROW, row))
+            if colGrowable:
+                ops.append((GROW_COL, col))
+
+
+class _PlanNode(object):
+    """
+    A sizer or widget of a plan being optimized.  `body` holds the children
+    added to it as (node, add op) pairs and any other ops applied to it as
+    (None, op) pairs, in order.
+    """
+
+    __slots__ = ("op", "body", "close")
+
+    def __init__(self, op):
+        self.op = op
+        self.body = []
+        self.close = None
+
+
+def optimizePlan(plan):
+    """
+    Returns a plan that builds fewer, cheaper sizers laying everything out
+    exactly as `plan` does.  A plain BoxSizer holding a single child is
+    dropped when its child fills it, the child taking its place with both
+    borders.  Grids of single cells in rows of equal length, without
+    explicit positions or growable rows and columns, become FlexGridSizers.
+    Sections (StaticBoxSizers and scrolled sections) are kept as they are.
+    """
+    root = _PlanNode(None)
+    stack = [root]
+    for op in plan.ops:
+        code = op[0]
+        if code in (BOX, GRID, SECTION, WIDGET):
+            stack.append(_PlanNode(op))
+        elif code is ADD or code is PLACE:
+            child = stack.pop()
+            stack[-1].body.append((child, op))
+        elif code is END_SECTION:
+            stack[-1].close = op
+        else:
+            stack[-1].body.append((None, op))
+    _optimizeNode(root, wx.VERTICAL)
+    ops = []
+    _emitNode(root, ops)
+    return BuildPlan(ops, plan.shape, plan.size)
+
+
+def _optimizeNode(node, orient):
+    for i, (child, op) in enumerate(node.body):
+        if child is None:
+            continue
+        code = child.op[0]
+        if code is BOX:
+            _optimizeNode(child, child.op[1])
+        elif code is SECTION:
+            _optimizeNode(child, wx.VERTICAL)
+        elif code is GRID:
+            _optimizeNode(child, None)
+            _flexGrid(child)
+        if orient is not None and op[0] is ADD:
+            node.body[i] = _mergeBox(child, op, orient)
+
+
+def _mergeBox(box, op, orient):
+    """
+    Replaces a single child BoxSizer, added to a box of `orient` with `op`,
+    by its child when the child always fills the box.  The child fills the
+    box when it expands across it and is stretched along it, or the box is
+    never given more than its minimum size along it.
+    """
+    while box.op[0] is BOX and len(box.body) == 1:
+        child, childOp = box.body[0]
+        if (
+            child is None
+            or childOp[0] is not ADD
+            or childOp[2] != op[2]
+            or (op[2] & Form.VC) != Form.VC
+        ):
+            break
+        if not (childOp[1] > 0 or (box.op[1] == orient and op[1] == 0)):
+            break
+        box, op = child, (ADD, op[1], op[2], op[3] + childOp[3])
+    return box, op
+
+
+def _flexGrid(grid):
+    cells = grid.body
+    if not cells or any(child is None for child, op in cells):
+        return
+    cols = 1 + max(op[1][1] for child, op in cells)
+    if len(cells) % cols:
+        return
+    for index, (child, op) in enumerate(cells):
+        if op[1] != divmod(index, cols) or tuple(op[2]) != (1, 1):
+            return
+    grid.op = (FLEX, cols)
+    grid.body = [(child, (ADD, 0, op[3], 1)) for child, op in cells]
+
+
+def _emitNode(node, ops):
+    if node.op is not None:
+        ops.append(node.op)
+    for child, op in node.body:
+        if child is not None:
+            _emitNode(child, ops)
+        ops.append(op)
+    if node.close is not None:
+        ops.append(node.close)
+
+
 if __name__ == "__main__":
     from src.pyform.Demos import (
         DemoForm,
@@ -0,0 +1,521 @@
+"""
+Headless layout of form declarations.
+
+`layout` works out where every element of a form["Parts"] declaration ends
+up without creating a single window, so declarations can be checked on a
+machine without a display.  The declaration is compiled into the same
+BuildPlan Form.build replays, and the plan is replayed into a small model of
+the sizers it would create: box sizers, static box sections, scrolled
+sections, grid bag and flex grid sizers, with wx 3's rules for borders,
+proportions, EXPAND, alignment and growable rows and columns.
+
+Widget sizes are estimates.  SizeEstimates holds a minimum size per control
+type, which can be replaced or extended for a particular platform or theme.
+The rectangles are only as good as those estimates, but they're exact about
+structure: which elements share a row, which grow, and whether any overlap.
+
+    result = layout(MyForm.parts, size=(640, 480))
+    result.rects["Name"]  # Rect(x=..., y=..., width=..., height=...)
+"""
+
+from collections import OrderedDict, namedtuple
+
+import wx
+
+from .Controls import Spec
+from .Form import (
+    ADD,
+    BOX,
+    END_SECTION,
+    FLEX,
+    GRID,
+    GROW,
+    GROW_COL,
+    GROW_ROW,
+    PLACE,
+    SECTION,
+    WIDGET,
+    Form,
+    compilePlan,
+)
+
+Rect = namedtuple("Rect", "x y width height")
+
+
+def _label(declarator, estimates):
+    label = str(declarator.kwargs.get("label", ""))
+    lines = label.split("\n") or [""]
+    width = max(len(line) for line in lines) * estimates.charWidth
+    return width, len(lines) * estimates.charHeight
+
+
+def _button(declarator, estimates):
+    width, height = _label(declarator, estimates)
+    return max(85, width + 24), height + 14
+
+
+def _check(declarator, estimates):
+    width, height = _label(declarator, estimates)
+    return width + 24, max(height, 20)
+
+
+def _line(declarator, estimates):
+    if declarator.kwargs.get("style", 0) & wx.LI_VERTICAL:
+        return 2, 10
+    return 10, 2
+
+
+# Minimum sizes by control class name, roughly those of wxGTK's defaults.
+DEFAULT_SIZES = {
+    "StaticText": _label,
+    "TextFlow": _label,
+    "HyperlinkCtrl": _label,
+    "Button": _button,
+    "FontPicker": _button,
+    "CheckBox": _check,
+    "RadioButton": _check,
+    "StaticLine": _line,
+    "TextCtrl": (120, 30),
+    "IpAddrCtrl": (120, 30),
+    "NumCtrl": (100, 30),
+    "ComboBox": (140, 32),
+    "ComboTreeBox": (140, 32),
+    "SpinCtrl": (120, 32),
+    "FloatSpin": (100, 30),
+    "DatePickerCtrl": (120, 32),
+    "Slider": (100, 25),
+    "ColorPicker": (40, 32),
+    "FolderBrowser": (250, 32),
+    "FileBrowser": (250, 32),
+    "ListBox": (100, 80),
+    "CheckListBox": (120, 80),
+    "ListCtrl": (200, 120),
+    "TreeCtrl": (150, 150),
+    "CheckTreeCtrl": (150, 150),
+    "Grid": (300, 150),
+    "Notebook": (300, 200),
+    "Console": (400, 200),
+    "StaticBitmap": (16, 16),
+    "Panel": (20, 20),
+    "ScrolledPanel": (20, 20),
+}
+
+
+class SizeEstimates(object):
+    """
+    Estimates the minimum size of controls.  `sizes` maps a control class
+    (or its name) to a (width, height) pair, or to a callable taking the
+    declarator and the estimates that returns one.  Entries are looked up
+    along the control's class hierarchy, so an entry for TextCtrl covers
+    PassCtrl as well.  A size given to the control itself always wins.
+    """
+
+    charWidth = 7
+    charHeight = 17
+    # Room a StaticBox takes around its contents.
+    boxTop = 20
+    boxSide = 5
+    default = (80, 30)
+
+    def __init__(self, sizes=None):
+        self.sizes = dict(DEFAULT_SIZES)
+        self.sizes.update(sizes or {})
+
+    def register(self, control, size):
+        self.sizes[control] = size
+
+    def estimate(self, declarator):
+        width, height = declarator.kwargs.get("size", (-1, -1))
+        if width != -1 and height != -1:
+            return width, height
+        size = self.default
+        for cls in type(declarator).__mro__:
+            entry = self.sizes.get(cls, self.sizes.get(cls.__name__))
+            if entry is not None:
+                size = entry(declarator, self) if callable(entry) else entry
+                break
+        return (
+            size[0] if width == -1 else width,
+            size[1] if height == -1 else height,
+        )
+
+
+class _Leaf(object):
+    def __init__(self, declarator, size):
+        self.declarator = declarator
+        self.size = size
+
+    def min(self):
+        return self.size
+
+    def place(self, x, y, width, height, result):
+        result.add(self.declarator, Rect(x, y, width, height))
+
+
+class _Item(object):
+    """
+    A node added to a sizer, along with how it was added.
+    """
+
+    def __init__(self, node, proportion, flag, border, pos=None, span=None):
+        self.node = node
+        self.proportion = proportion
+        self.flag = flag
+        self.border = border
+        self.pos = pos
+        self.span = span
+        self._min = None
+
+    def borders(self):
+        flag, border = self.flag, self.border
+        return (
+            border if flag & wx.LEFT else 0,
+            border if flag & wx.TOP else 0,
+            border if flag & wx.RIGHT else 0,
+            border if flag & wx.BOTTOM else 0,
+        )
+
+    def min(self):
+        if self._min is None:
+            left, top, right, bottom = self.borders()
+            width, height = self.node.min()
+            self._min = (width + left + right, height + top + bottom)
+        return self._min
+
+    def place(self, x, y, width, height, fillWidth, fillHeight, result):
+        """
+        Places the node in a cell, after taking off the border.  The node fills
+        the cell along the axes it's allowed to, and is aligned according to
+        its flags along the others.
+        """
+        left, top, right, bottom = self.borders()
+        x, y = x + left, y + top
+        width, height = width - left - right, height - top - bottom
+        minWidth, minHeight = self.node.min()
+        flag = self.flag
+        if not (fillWidth or flag & wx.EXPAND) and width > minWidth:
+            if flag & wx.ALIGN_RIGHT:
+                x += width - minWidth
+            elif flag & wx.ALIGN_CENTER_HORIZONTAL:
+                x += (width - minWidth) // 2
+            width = minWidth
+        if not (fillHeight or flag & wx.EXPAND) and height > minHeight:
+            if flag & wx.ALIGN_BOTTOM:
+                y += height - minHeight
+            elif flag & wx.ALIGN_CENTER_VERTICAL:
+                y += (height - minHeight) // 2
+            height = minHeight
+        self.node.place(x, y, width, height, result)
+
+
+def _share(extra, weights):
+    # Splits `extra` between the weights, the remainder going to the last.
+    total = sum(weights)
+    if extra <= 0 or not total:
+        return [0] * len(weights)
+    shares = [extra * weight // total for weight in weights]
+    last = max(i for i, weight in enumerate(weights) if weight)
+    shares[last] += extra - sum(shares)
+    return shares
+
+
+class _Box(object):
+    def __init__(self, orient):
+        self.vertical = orient == wx.VERTICAL
+        self.items = []
+
+    def Add(self, node, proportion=0, flag=0, border=0):
+        self.items.append(_Item(node, proportion, flag, border))
+
+    def _major(self, size):
+        return size[1] if self.vertical else size[0]
+
+    def min(self):
+        """
+        Like wx 3's BoxSizer, stretchable items need enough room to all get
+        their minimum size while keeping to their proportions.
+        """
+        fixed = across = total = 0
+        ratio = 0.0
+        for item in self.items:
+            size = item.min()
+            if item.proportion:
+                ratio = max(ratio, self._major(size) / item.proportion)
+                total += item.proportion
+            else:
+                fixed += self._major(size)
+            across = max(across, size[0] if self.vertical else size[1])
+        major = fixed + int(ratio * total)
+        return (across, major) if self.vertical else (major, across)
+
+    def sizes(self, available):
+        """
+        Splits `available` between the items the way wx 3's BoxSizer does:
+        the whole size is divided by proportion, and items whose share would
+        be less than their minimum get their minimum instead, leaving the
+        rest to be divided again between the others.  Each pass settles every
+        item it finds short, so fixed items all settle in the first one.
+        """
+        items = self.items
+        mins = [max(0, self._major(item.min())) for item in items]
+        sizes = [None] * len(items)
+        remaining, total = available, sum(item.proportion for item in items)
+        changed = True
+        while changed:
+            changed = False
+            for i, item in enumerate(items):
+                if sizes[i] is not None:
+                    continue
+                least = mins[i]
+                if item.proportion:
+                    if int(remaining * item.proportion / total) >= least:
+                        continue
+                    total -= item.proportion
+                sizes[i] = least
+                remaining -= least
+                changed = True
+        for i, item in enumerate(items):
+            if sizes[i] is None:
+                sizes[i] = int(remaining * item.proportion / total)
+                remaining -= sizes[i]
+                total -= item.proportion
+        return sizes
+
+    def place(self, x, y, width, height, result):
+        sizes = self.sizes(height if self.vertical else width)
+        for item, size in zip(self.items, sizes):
+            if self.vertical:
+                item.place(x, y, width, size, False, True, result)
+                y += size
+            else:
+                item.place(x, y, size, height, True, False, result)
+                x += size
+
+
+class _Section(_Box):
+    """
+    A StaticBoxSizer, a vertical box inside the border of a StaticBox.
+    """
+
+    def __init__(self, display, estimates):
+        _Box.__init__(self, wx.VERTICAL)
+        self.display = display
+        self.top, self.side = estimates.boxTop, estimates.boxSide
+
+    def min(self):
+        width, height = _Box.min(self)
+        return width + 2 * self.side, height + self.top + self.side
+
+    def place(self, x, y, width, height, result):
+        result.sections.append((self.display, Rect(x, y, width, height)))
+        _Box.place(
+            self,
+            x + self.side,
+            y + self.top,
+            width - 2 * self.side,
+            height - self.top - self.side,
+            result,
+        )
+
+
+class _Scrolled(object):
+    """
+    The ScrolledPanel of a scrolled section.  Its contents are laid out at
+    no less than their minimum size, scrolled to the top left.
+    """
+
+    def __init__(self):
+        self.sizer = None
+
+    def min(self):
+        return self.sizer.min()
+
+    def place(self, x, y, width, height, result):
+        minWidth, minHeight = self.sizer.min()
+        self.sizer.place(x, y, max(width, minWidth), max(height, minHeight), result)
+
+
+class _Grid(object):
+    """
+    A GridBagSizer without gaps, like the ones Form.makeGrid creates.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.growableRows = []
+        self.growableCols = []
+
+    def Add(self, node, pos, span, flag=0, border=0):
+        self.items.append(_Item(node, 0, flag, border, pos, span))
+
+    def GetRows(self):
+        return max([item.pos[0] + item.span[0] for item in self.items] or [0])
+
+    def GetCols(self):
+        return max([item.pos[1] + item.span[1] for item in self.items] or [0])
+
+    def _lines(self, axis, count):
+        sizes = [0] * count
+        # Single cells first, then spanning items widen what they span.
+        ordered = sorted(self.items, key=lambda item: item.span[axis])
+        for item in ordered:
+            start, span, need = item.pos[axis], item.span[axis], item.min()[axis]
+            have = sum(sizes[start : start + span])
+            if need > have:
+                for i, share in enumerate(_share(need - have, [1] * span)):
+                    sizes[start + i] += share
+        return sizes
+
+    def _sizes(self):
+        return self._lines(1, self.GetCols()), self._lines(0, self.GetRows())
+
+    def min(self):
+        widths, heights = self._sizes()
+        return sum(widths), sum(heights)
+
+    def place(self, x, y, width, height, result):
+        widths, heights = self._sizes()
+        for sizes, growable, extra in (
+            (widths, self.growableCols, width - sum(widths)),
+            (heights, self.growableRows, height - sum(heights)),
+        ):
+            weights = [1 if i in growable else 0 for i in range(len(sizes))]
+            for i, share in enumerate(_share(extra, weights)):
+                sizes[i] += share
+        for item in self.items:
+            row, col = item.pos
+            rows, cols = item.span
+            item.place(
+                x + sum(widths[:col]),
+                y + sum(heights[:row]),
+                sum(widths[col : col + cols]),
+                sum(heights[row : row + rows]),
+                False,
+                False,
+                result,
+            )
+
+
+class _Flex(_Grid):
+    """
+    A FlexGridSizer, filled a row at a time.
+    """
+
+    def __init__(self, cols):
+        _Grid.__init__(self)
+        self.cols = cols
+
+    def Add(self, node, proportion=0, flag=0, border=0):
+        count = len(self.items)
+        pos = (count // self.cols, count % self.cols)
+        self.items.append(_Item(node, proportion, flag, border, pos, (1, 1)))
+
+
+class FormLayout(object):
+    """
+    The outcome of a headless layout.  `size` is the size the form was laid
+    out at, `rects` maps the names of named elements to their Rect, `items`
+    lists every (declarator, Rect) in build order and `sections` every
+    (display, Rect) of a StaticBox section.  Rects are relative to the form.
+    """
+
+    def __init__(self):
+        self.size = (0, 0)
+        self.minSize = (0, 0)
+        self.rects = OrderedDict()
+        self.items = []
+        self.sections = []
+
+    def add(self, declarator, rect):
+        self.items.append((declarator, rect))
+        if declarator.name:
+            self.rects[declarator.name] = rect
+
+    def overlaps(self):
+        """
+        Returns the pairs of named elements whose rectangles overlap.
+        """
+        found, rects = [], list(self.rects.items())
+        for i, (name, a) in enumerate(rects):
+            for other, b in rects[i + 1 :]:
+                if (
+                    a.x < b.x + b.width
+                    and b.x < a.x + a.width
+                    and a.y < b.y + b.height
+                    and b.y < a.y + a.height
+                ):
+                    found.append((name, other))
+        return found
+
+
+def layout(parts, size=None, gap=3, estimates=None):
+    """
+    Lays out a form declaration, either the Parts of a form or the whole
+    form dict, at `size` or at its minimum size (which is what
+    SetSizerAndFit gives a form) and returns a FormLayout.
+    """
+    if isinstance(parts, dict) and "Parts" in parts:
+        parts = parts["Parts"]
+    plan, leaves = compilePlan(parts)
+    return layoutPlan(plan, leaves, size, gap, estimates)
+
+
+def layoutPlan(plan, leaves, size=None, gap=3, estimates=None):
+    """
+    Lays out a compiled BuildPlan, replaying it the way Form.replayPlan does.
+    """
+    estimates = estimates or SizeEstimates()
+    root = _Box(wx.VERTICAL)
+    stack = [root]
+    for op in plan.ops:
+        code = op[0]
+        if code is WIDGET:
+            leaf = leaves[op[1]]
+            if isinstance(leaf, Spec):
+                leaf = leaf.create()
+            stack.append(_Leaf(leaf, estimates.estimate(leaf)))
+        elif code is ADD:
+            item = stack.pop()
+            stack[-1].Add(item, op[1], flag=op[2], border=gap * op[3])
+        elif code is PLACE:
+            item = stack.pop()
+            stack[-1].Add(item, op[1], op[2], border=gap, flag=op[3])
+        elif code is BOX:
+            stack.append(_Box(op[1]))
+        elif code is GRID:
+            stack.append(_Grid())
+        elif code is FLEX:
+            stack.append(_Flex(op[1]))
+        elif code is SECTION:
+            display, flags = op[1], op[2]
+            if flags & Form.NC:
+                sizer = _Box(wx.VERTICAL)
+            else:
+                sizer = _Section(display, estimates)
+            stack.append(sizer)
+            if flags & Form.S:
+                scrolled = _Scrolled()
+                sizer.Add(scrolled, 1, flag=Form.VC, border=gap)
+                stack.append(scrolled)
+                stack.append(_Box(wx.VERTICAL))
+        elif code is END_SECTION:
+            if op[1] & Form.S:
+                sizer = stack.pop()
+                stack.pop().sizer = sizer
+        elif code is GROW:
+            stack[-1].growableRows.append(op[1])
+            stack[-1].growableCols.append(op[2])
+        elif code is GROW_ROW:
+            grid = stack[-1]
+            if op[1] < grid.GetRows() and op[1] not in grid.growableRows:
+                grid.growableRows.append(op[1])
+        elif code is GROW_COL:
+            grid = stack[-1]
+            if op[1] < grid.GetCols() and op[1] not in grid.growableCols:
+                grid.growableCols.append(op[1])
+    result = FormLayout()
+    result.minSize = root.min()
+    width, height = size or result.minSize
+    result.size = (max(width, result.minSize[0]), max(height, result.minSize[1]))
+    root.place(0, 0, result.size[0], result.size[1], result)
+    return result
@@ -0,0 +1,307 @@
+"""
+Form definitions read from JSON or TOML files.
+
+A definition file holds the same keys as a `form` dict.  Parts is a list of
+sections, each with the blocks it contains:
+
+    Title = "Customer"
+    Disabled = ["Id"]
+    Validators = { Name = "NotEmpty" }
+
+    [[Parts]]
+    section = "Customer"
+    flags = ["G"]
+    blocks = [
+        { control = "TextCtrl", name = "Id" },
+        { row = [
+            { control = "StaticText", label = "Name" },
+            { control = "TextCtrl", name = "Name", proportion = 1 },
+        ], proportion = 1 },
+        { grid = [[{ control = "CheckBox", name = "Active" }]] },
+        { container = [{ section = "Nested", blocks = ["Plain text"] }] },
+    ]
+
+    [Translations.Status]
+    pairs = [[1, "Open"], [2, "Closed"]]
+    mode = "default"
+    default = ["Unknown", 0]
+
+A block is a control (named by its class in the Controls module or by a
+dotted path), a row, a grid of rows, a nested container or a plain string
+for a StaticText.  Controls become Specs, so the parsed Parts are shared by
+every form built from them.  "style" and "flags" may name wx constants
+("TE_MULTILINE|TE_PASSWORD"), section flags the Form ones ("G", "NC", "S").
+Validators are looked up in the registry filled by `registerValidator`, or
+imported by dotted path.  Translations give either "pairs" of machine and
+human values or "m2h" and "h2m" tables, with an optional mode and defaults.
+
+Parsed definitions are pickled to a __pycache__ directory next to the file,
+keyed by a hash of the file's contents, so later loads skip parsing.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+
+import wx
+
+from . import Controls
+from .Controls import Row, StaticText
+from .Form import Form, FormDialog
+from .Translate import PASSTHROUGH
+
+# Bump when the parsed structure changes, older caches are then ignored.
+CACHE_VERSION = 1
+EXTENSIONS = (".json", ".toml")
+
+VALIDATORS = {}
+
+
+class DefinitionError(ValueError):
+    pass
+
+
+def registerValidator(validator, name=None):
+    """
+    Makes a validator class available to definition files by name.  Can be
+    used as a class decorator.
+    """
+    VALIDATORS[name or validator.__name__] = validator
+    return validator
+
+
+def _import(path):
+    module, _, name = path.rpartition(".")
+    if not module:
+        raise DefinitionError(f"Can't find {path!r}.")
+    try:
+        return getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError) as e:
+        raise DefinitionError(f"Can't import {path!r}: {e}") from e
+
+
+def _control(name):
+    control = getattr(Controls, name, None)
+    if isinstance(control, type):
+        return control
+    return _import(name)
+
+
+def _validator(name):
+    if name in VALIDATORS:
+        return VALIDATORS[name]
+    return _import(name)
+
+
+def _constants(value, names=wx):
+    # "TE_MULTILINE|TE_PASSWORD" or ["TE_MULTILINE", "TE_PASSWORD"].
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.split("|")
+    result = 0
+    for name in value:
+        try:
+            result |= getattr(names, name.strip())
+        except AttributeError:
+            raise DefinitionError(f"Unknown flag {name!r}.") from None
+    return result
+
+
+def _options(block):
+    options = {}
+    for key, value in block.items():
+        if key in ("span", "size", "pos") and isinstance(value, list):
+            value = tuple(value)
+        elif key in ("style", "flags"):
+            value = _constants(value)
+        options[key] = value
+    return options
+
+
+def parseContainer(sections):
+    container = OrderedDict()
+    for section in sections:
+        display = section.get("section", "")
+        flags = section.get("flags", 0)
+        key = (display, _constants(flags, Form)) if flags else display
+        container[key] = [parseBlock(block) for block in section.get("blocks", [])]
+    return container
+
+
+def parseBlock(block):
+    if isinstance(block, str):
+        return StaticText.spec(label=block)
+    block = dict(block)
+    if "control" in block:
+        return _control(block.pop("control")).spec(**_options(block))
+    if "row" in block:
+        fields = tuple(parseBlock(field) for field in block.pop("row"))
+        return Row(fields, **_options(block)) if block else fields
+    if "grid" in block:
+        return [tuple(parseBlock(field) for field in row) for row in block["grid"]]
+    if "container" in block:
+        return parseContainer(block["container"])
+    raise DefinitionError(f"Don't know how to build {block!r}.")
+
+
+def _key(value):
+    # JSON object keys are always strings, lists aren't hashable.
+    return tuple(value) if isinstance(value, list) else value
+
+
+def parseTranslation(entry):
+    if "pairs" in entry:
+        m2h = {_key(machine): human for machine, human in entry["pairs"]}
+        h2m = {_key(human): machine for machine, human in entry["pairs"]}
+    else:
+        m2h, h2m = dict(entry["m2h"]), dict(entry["h2m"])
+    translation = (m2h, h2m)
+    if "mode" in entry or "default" in entry:
+        translation += (entry.get("mode", PASSTHROUGH),)
+    if "default" in entry:
+        translation += (tuple(entry["default"]),)
+    return translation
+
+
+def parseDefinition(data):
+    """
+    Turns the data read from a definition file into a form dict.
+    """
+    form = dict(data)
+    if "Parts" not in form:
+        raise DefinitionError("A form definition needs Parts.")
+    form["Parts"] = parseContainer(form["Parts"])
+    if "Validators" in form:
+        form["Validators"] = {
+            name: _validator(path) for name, path in form["Validators"].items()
+        }
+    if "Translations" in form:
+        form["Translations"] = {
+            name: parseTranslation(entry)
+            for name, entry in form["Translations"].items()
+        }
+    if "Buttons" in form:
+        form["Buttons"] = _constants(form["Buttons"])
+    return form
+
+
+def _read(path, raw):
+    if path.endswith(".toml"):
+        # tomllib is new in Python 3.11, tomli is the same parser for older
+        # versions.  Neither is needed for JSON definitions.
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise DefinitionError(
+                    f"Reading {path} needs Python 3.11 or the tomli package."
+                ) from None
+        return tomllib.loads(raw.decode("utf-8"))
+    return json.loads(raw)
+
+
+def _cachePath(path):
+    folder, filename = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, "__pycache__", f"{filename}.form.pickle")
+
+
+def loadDefinition(path, cache=True):
+    """
+    Reads a definition file and returns its form dict, from the cache when
+    the file hasn't changed since it was last parsed.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    cached = _cachePath(path)
+    if cache:
+        try:
+            with open(cached, "rb") as f:
+                version, key, form = pickle.load(f)
+            if version == CACHE_VERSION and key == digest:
+                return form
+        except Exception:
+            pass
+    form = parseDefinition(_read(path, raw))
+    if cache:
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            temporary = f"{cached}.{os.getpid()}"
+            with open(temporary, "wb") as f:
+                pickle.dump((CACHE_VERSION, digest, form), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, cached)
+        except (OSError, pickle.PicklingError, AttributeError):
+            # A read-only install, or a definition referring to something
+            # pickle can't find again, just doesn't get a cache.
+            pass
+    return form
+
+
+class LoadedForm(Form):
+    """
+    A Form built from a definition.  The definition is shared by every
+    instance; each gets its own copies of the parts of it Form changes.
+    """
+
+    definition = None
+
+    def __init__(self, parent, **kwargs):
+        definition = self.definition
+        self.form = dict(definition)
+        for key in ("Defaults", "Options"):
+            if key in definition:
+                self.form[key] = dict(definition[key])
+        if "Disabled" in definition:
+            self.form["Disabled"] = list(definition["Disabled"])
+        super(LoadedForm, self).__init__(parent, **kwargs)
+
+
+class FormLibrary(object):
+    """
+    The definition files in a set of directories, by file name without the
+    extension.  Nothing is read until a form is first asked for.
+    """
+
+    def __init__(self, *directories, cache=True):
+        self.cache = cache
+        self.paths = OrderedDict()
+        self._classes = {}
+        for directory in directories:
+            for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+                name, ext = os.path.splitext(entry.name)
+                if ext in EXTENSIONS and entry.is_file():
+                    self.paths[name] = entry.path
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, name):
+        """
+        Returns the Form subclass for a definition, loading it the first time.
+        """
+        cls = self._classes.get(name)
+        if cls is None:
+            definition = loadDefinition(self.paths[name], self.cache)
+            cls = type(name, (LoadedForm,), {"definition": definition})
+            self._classes[name] = cls
+        return cls
+
+    def open(self, parent, name, pooled=False, **kwargs):
+        """
+        Shows a definition in a FormDialog.
+        """
+        if pooled:
+            return FormDialog.open(parent, self[name], **kwargs)
+        return FormDialog(parent, self[name], **kwargs)
@@ -0,0 +1,172 @@
+"""
+Loading form defaults and options without blocking the UI.
+
+A Form subclass can provide `loadDefaultsAsync` and/or `loadOptionsAsync`.
+They are called on a worker thread after the form is built and may return a
+mapping of field name to value, or yield (name, value) pairs as the data
+comes in.  Either can also be a coroutine or an async generator, in which
+case it runs in its own event loop on the worker thread.  They must not
+touch widgets.
+
+Values that arrive while the UI thread is busy are collected and applied
+together in the next batch.  Loaded values are kept in the form's own copy
+of its Defaults and Options, never in a definition shared with other
+instances.  Fields waiting for data are busy (disabled) until they are
+filled, and `ready` is a concurrent.futures.Future that is resolved once
+everything has been applied.  The UI thread resolves it, so it must never
+wait on it; use `whenReady` there instead.
+"""
+
+import asyncio
+import inspect
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Future
+from traceback import print_exc
+
+import wx
+
+from .util.Workers import executor as sharedExecutor
+
+DEFAULTS = "Defaults"
+OPTIONS = "Options"
+
+
+def _window(field):
+    # Declarators that wrap their control, like ColorPicker, keep it in
+    # `element`; fields without a window can't be made busy.
+    if isinstance(field, wx.Window):
+        return field
+    return getattr(field, "element", None)
+
+
+class AsyncLoader(object):
+    """
+    Runs a form's asynchronous loaders and applies what they produce on the
+    UI thread.  `busy` holds the names of the fields still waiting.
+    """
+
+    def __init__(self, form, sources, busy=(), executor=None):
+        self.form = form
+        self.ready = Future()
+        if sources:
+            # form.form is often a class attribute, shared by every instance.
+            form.form = dict(form.form)
+            for kind in (DEFAULTS, OPTIONS):
+                form.form[kind] = dict(form.form[kind])
+        self.busy = set()
+        self._lock = threading.Lock()
+        self._incoming = []
+        self._flushing = False
+        self._running = len(sources)
+        self._error = None
+        for name in busy:
+            self.setBusy(name, True)
+        pool = executor or sharedExecutor()
+        for kind, source in sources:
+            pool.submit(self._drain, kind, source)
+        if not sources:
+            self._finish()
+
+    def whenReady(self, callback):
+        """
+        Calls `callback` with the `ready` future on the UI thread once the
+        loaded data has been applied, or on the next pass of the event loop
+        if it already has been.
+        """
+        self.ready.add_done_callback(lambda future: wx.CallAfter(callback, future))
+
+    def setBusy(self, name, busy):
+        window = _window(self.form.elements.get(name))
+        if window is None:
+            return
+        if busy:
+            self.busy.add(name)
+            window.Enable(False)
+        elif name in self.busy:
+            self.busy.discard(name)
+            window.Enable(name not in self.form.form["Disabled"])
+
+    # Worker thread.
+
+    def _drain(self, kind, source):
+        try:
+            data = source()
+            if inspect.iscoroutine(data):
+                data = asyncio.run(data)
+            if inspect.isasyncgen(data):
+                asyncio.run(self._pump(kind, data))
+            else:
+                if isinstance(data, Mapping):
+                    data = data.items()
+                for name, value in data or ():
+                    self._receive(kind, name, value)
+        except Exception as e:
+            print_exc()
+            self._error = e
+        finally:
+            self._receive(kind, None, None)
+
+    async def _pump(self, kind, data):
+        async for name, value in data:
+            self._receive(kind, name, value)
+
+    def _receive(self, kind, name, value):
+        # A name of None marks the end of a source.
+        with self._lock:
+            self._incoming.append((kind, name, value))
+            if self._flushing:
+                return
+            self._flushing = True
+        wx.CallAfter(self.flush)
+
+    # UI thread.
+
+    def flush(self):
+        """
+        Applies everything that has arrived since the last flush, options
+        first so values can be selected from them.
+        """
+        with self._lock:
+            incoming, self._incoming = self._incoming, []
+            self._flushing = False
+        # The form may have been closed while its data was loading.
+        if not self.form:
+            self.ready.cancel()
+            return
+        form, defaults = self.form, {}
+        for kind, name, value in incoming:
+            if name is None:
+                self._running -= 1
+            elif kind == OPTIONS:
+                form.form[OPTIONS][name] = value
+                field = form.elements.get(name)
+                if field is not None and hasattr(field, "SetOptions"):
+                    field.SetOptions(value)
+                    if name in form.form[DEFAULTS]:
+                        defaults[name] = form.form[DEFAULTS][name]
+            else:
+                form.form[DEFAULTS][name] = value
+                defaults[name] = value
+        if defaults:
+            report = form.set_values(
+                {name: val for name, val in defaults.items() if name in form.elements}
+            )
+            # Loaded defaults are what the form starts out with, not changes.
+            form.mark_clean(values=report.values)
+        for name in defaults:
+            self.setBusy(name, False)
+        if self._running == 0:
+            self._finish()
+
+    def _finish(self):
+        # Fields nothing was loaded for aren't waiting any more either.
+        for name in list(self.busy):
+            self.setBusy(name, False)
+        if self.ready.done():
+            return
+        if self._error is not None:
+            self.ready.set_exception(self._error)
+        else:
+            self.ready.set_result(self.form)
+        self.form.onLoaded()
@@ -0,0 +1,105 @@
+"""
+Timings and structural statistics for a single Form.build.
+
+Forms with `collectStats` set keep a BuildStats in `build_stats` after they
+are built.  Forms built by walking their declaration get inclusive timings
+for each parse method, so parseContainer includes the sections inside it.
+Forms replayed from a BuildPlan don't call the parse methods at all and get
+timings per plan operation instead, with widget creation still reported as
+makeWidget.
+"""
+
+import logging
+from collections import Counter, OrderedDict
+from functools import wraps
+from time import perf_counter
+
+logger = logging.getLogger("pyform")
+
+
+class BuildStats(object):
+    """
+    `timings` maps a phase to its [calls, seconds], `widgets` counts the
+    widgets in the form by control type, `sizers` counts its sizers and
+    `depth` is how deeply they nest.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.path = None
+        self.total = 0.0
+        self.timings = OrderedDict()
+        self.widgets = Counter()
+        self.sizers = 0
+        self.depth = 0
+
+    def add(self, phase, seconds):
+        entry = self.timings.get(phase)
+        if entry is None:
+            entry = self.timings[phase] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def timed(self, phase, method):
+        """
+        Wraps a method so every call to it is timed under `phase`.
+        """
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add(phase, perf_counter() - start)
+
+        return wrapper
+
+    def measure(self, sizer, elements=(), depth=1):
+        """
+        Counts the sizers and widgets in a built sizer tree.  The form's
+        `elements` count as one widget each, whatever windows and sizers they
+        are made of (a FloatSpin's text control and buttons, say).
+        """
+        fields = {id(field) for field in elements}
+        fields.update(
+            id(field.element)
+            for field in elements
+            if getattr(field, "element", None) is not None
+        )
+        self._measure(sizer, fields, depth)
+
+    def _measure(self, sizer, fields, depth):
+        self.sizers += 1
+        self.depth = max(self.depth, depth)
+        for item in sizer.GetChildren():
+            if item.IsSizer():
+                self._measure(item.GetSizer(), fields, depth + 1)
+            elif item.IsWindow():
+                window = item.GetWindow()
+                self.widgets[type(window).__name__] += 1
+                # Scrolled sections hold their contents in a sizer of their own.
+                if id(window) not in fields and window.GetSizer() is not None:
+                    self._measure(window.GetSizer(), fields, depth + 1)
+
+    def summary(self):
+        """
+        Returns the stats as a single line of text.
+        """
+        widgets = ", ".join(
+            f"{count} {name}" for name, count in self.widgets.most_common(3)
+        )
+        phases = ", ".join(
+            f"{phase} {seconds * 1000:.1f}ms/{calls}"
+            for phase, (calls, seconds) in sorted(
+                self.timings.items(), key=lambda item: -item[1][1]
+            )[:4]
+        )
+        return (
+            f"{self.name} built in {self.total * 1000:.1f}ms ({self.path}): "
+            f"{sum(self.widgets.values())} widgets ({widgets}), "
+            f"{self.sizers} sizers, depth {self.depth}; {phases}"
+        )
+
+    def log(self, level=logging.INFO):
+        logger.log(level, self.summary())
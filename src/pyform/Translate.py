@@ -0,0 +1,99 @@
+"""
+Compiled translations between machine values and the values people see.
+
+A form's "Translations" map field names to a pair of lookup tables, machine
+to human first and human to machine second.  An entry may add a third item
+naming how values missing from the tables are handled, and a fourth holding
+the (machine to human, human to machine) values to use in DEFAULT mode:
+
+    form["Translations"] = {
+        "Status": ({1: "Open", 2: "Closed"}, {"Open": 1, "Closed": 2}),
+        "Kind": (kinds, reverse, DEFAULT, ("Unknown", 0)),
+    }
+"""
+
+# How values missing from a translation table are handled.
+PASSTHROUGH = "passthrough"
+DEFAULT = "default"
+ERROR = "error"
+
+MODES = (PASSTHROUGH, DEFAULT, ERROR)
+
+
+class TranslationError(KeyError):
+    pass
+
+
+class Translator(object):
+    """
+    Translates values through a single lookup table.  Calling it translates
+    one value, `column` translates a whole sequence of values in one go.
+    """
+
+    __slots__ = ("name", "table", "unknown", "default")
+
+    def __init__(self, name, table, unknown=PASSTHROUGH, default=None):
+        if unknown not in MODES:
+            raise ValueError(f"Unknown translation mode {unknown!r}.")
+        self.name = name
+        self.table = table
+        self.unknown = unknown
+        self.default = default
+
+    def __call__(self, value):
+        try:
+            return self.table[value]
+        except (KeyError, TypeError):
+            return self.missing(value)
+
+    def missing(self, value):
+        if self.unknown == PASSTHROUGH:
+            return value
+        if self.unknown == DEFAULT:
+            return self.default
+        raise TranslationError(f"No translation for {value!r} in {self.name!r}.")
+
+    def column(self, values):
+        if self.unknown == PASSTHROUGH:
+            get = self.table.get
+            try:
+                return [get(value, value) for value in values]
+            except TypeError:
+                pass
+        return [self(value) for value in values]
+
+
+def compileTranslations(translations, unknown=PASSTHROUGH):
+    """
+    Compiles a "Translations" mapping into a dict of field name to a
+    (machine to human, human to machine) pair of Translators.  `unknown` is
+    the mode used by entries that don't name their own.
+    """
+    compiled = {}
+    for name, entry in translations.items():
+        m2h, h2m = entry[0], entry[1]
+        mode = entry[2] if len(entry) > 2 else unknown
+        defaults = entry[3] if len(entry) > 3 else (None, None)
+        compiled[name] = (
+            Translator(name, m2h, mode, defaults[0]),
+            Translator(name, h2m, mode, defaults[1]),
+        )
+    return compiled
+
+
+def translateRecords(translators, records, toHuman=False):
+    """
+    Translates a list of records (mappings of field name to value) in bulk,
+    returning new records.  Fields without a translator are copied as is.
+    """
+    side = 0 if toHuman else 1
+    records = [dict(record) for record in records]
+    for name, pair in translators.items():
+        column = [record[name] for record in records if name in record]
+        if not column:
+            continue
+        translated = iter(pair[side].column(column))
+        for record in records:
+            if name in record:
+                record[name] = next(translated)
+    return records
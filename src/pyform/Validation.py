@@ -0,0 +1,123 @@
+"""
+Incremental validation of form fields.
+
+Instead of validating every field when the form is submitted, fields are
+validated shortly after they change and the outcome is kept until they
+change again.  Submitting then only has to deal with fields that are still
+dirty or still being validated.
+
+Validators keep the interface Form has always used, a class whose instances
+provide `Validate(field)` returning a (success, messages) pair.  Validators
+that are slow (a database lookup, a network check) can set `threaded = True`
+and provide `ValidateValue(value)` instead; those run on the worker pool (or
+any concurrent.futures executor passed in, a ProcessPoolExecutor included)
+with the value read on the UI thread, and their results are posted back to
+the UI thread.
+"""
+
+import wx
+
+from .util.FlowSizer import do_after
+from .util.Workers import executor as sharedExecutor
+
+
+class ValidationEngine(object):
+    """
+    Tracks which of a form's validated fields are dirty and keeps the last
+    result for every other one.  Changes are collected for `delay`
+    milliseconds and then validated together.
+    """
+
+    def __init__(self, form, executor=None, delay=250):
+        self.form = form
+        self.executor = executor
+        self.delay = delay
+        # Everything starts out dirty, nothing has been validated yet.
+        self.dirty = set(form.form["Validators"])
+        self.results = {}
+        self.pending = {}
+        self.generation = {}
+        form.changeListeners.append(self.markDirty)
+
+    def markDirty(self, name):
+        if name not in self.form.form["Validators"]:
+            return
+        self.dirty.add(name)
+        self.results.pop(name, None)
+        # Results of validations started before this change are stale.
+        self.generation[name] = self.generation.get(name, 0) + 1
+        self.pending.pop(name, None)
+        do_after(self.delay, self.validateDirty)
+
+    def invalidate(self, names=None):
+        """
+        Forgets the results for `names` (every validated field by default),
+        for validators that depend on something other than the field itself.
+        """
+        for name in self.form.form["Validators"] if names is None else names:
+            self.markDirty(name)
+
+    def validateDirty(self):
+        # The form may have been closed before the deferred call came due.
+        if not self.form:
+            return
+        dirty, self.dirty = self.dirty, set()
+        for name in dirty:
+            self.validateField(name)
+
+    def validateField(self, name):
+        """
+        Validates one field now.  Threaded validators are only started, their
+        result arrives later through `finished`.
+        """
+        field = self.form.elements.get(name)
+        validator = field.ValidatorInstance() if field is not None else None
+        if validator is None:
+            self.results[name] = (True, [])
+            return
+        if getattr(validator, "threaded", False):
+            generation = self.generation.get(name, 0)
+            pool = self.executor or sharedExecutor()
+            future = pool.submit(validator.ValidateValue, field.GetValue())
+            self.pending[name] = future
+            future.add_done_callback(
+                lambda future: wx.CallAfter(self.finished, name, generation, future)
+            )
+        else:
+            self.results[name] = self.outcome(validator.Validate, field)
+            self.form.fieldValidated(name, *self.results[name])
+
+    def finished(self, name, generation, future):
+        if not self.form:
+            return
+        if generation != self.generation.get(name, 0) or name not in self.pending:
+            return
+        del self.pending[name]
+        self.results[name] = self.outcome(future.result)
+        self.form.fieldValidated(name, *self.results[name])
+
+    @staticmethod
+    def outcome(callable, *args):  # @ReservedAssignment
+        try:
+            return callable(*args)
+        except Exception as e:
+            return False, [str(e)]
+
+    def wait(self, timeout=None):
+        """
+        Validates the dirty fields, waits for the ones still being validated
+        off thread and returns the (success, messages) of the whole form, in
+        form order.
+        """
+        self.validateDirty()
+        for name, future in list(self.pending.items()):
+            self.results[name] = self.outcome(future.result, timeout)
+            self.pending.pop(name, None)
+        success, messages = True, []
+        for name in self.form.elements:
+            if name in self.results:
+                s, m = self.results[name]
+                if not s:
+                    success = False
+                    messages.extend(m)
+        return success, messages
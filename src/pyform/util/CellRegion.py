@@ -0,0 +1,117 @@
+"""
+A lazy description of a set of selected grid cells.
+
+Selections are kept as the rectangular blocks the grid reports, so selecting
+whole columns of a large grid costs one block rather than a tuple per cell.
+Cells are only produced when the region is iterated or explicitly asked for.
+"""
+
+
+def _merged(intervals):
+    """
+    Yields every index covered by a collection of inclusive intervals, in
+    order and without repeats.
+    """
+    end = None
+    for start, stop in sorted(intervals):
+        if end is not None and start <= end:
+            start = end + 1
+        if start <= stop:
+            yield from range(start, stop + 1)
+            end = stop
+
+
+class CellRegion(object):
+    """
+    A collection of (top, left, bottom, right) blocks of cells, inclusive on
+    both ends.  The region behaves like a read only sequence of (row, col)
+    tuples, in block order, without creating those tuples up front.
+    """
+
+    __slots__ = ("blocks",)
+
+    def __init__(self, blocks=()):
+        self.blocks = list(blocks)
+
+    @classmethod
+    def FromCorners(cls, toplefts, bottomrights):
+        region = cls()
+        for (top, left), (bottom, right) in zip(toplefts, bottomrights):
+            region.Add(top, left, bottom, right)
+        return region
+
+    def Add(self, top, left, bottom=None, right=None):
+        """
+        Adds a block of cells.  A single cell only needs its row and column.
+        """
+        bottom = top if bottom is None else bottom
+        right = left if right is None else right
+        self.blocks.append((top, left, bottom, right))
+
+    def __len__(self):
+        return sum(
+            (bottom - top + 1) * (right - left + 1)
+            for top, left, bottom, right in self.blocks
+        )
+
+    def __bool__(self):
+        return bool(self.blocks)
+
+    def __contains__(self, cell):
+        row, col = cell
+        return any(
+            top <= row <= bottom and left <= col <= right
+            for top, left, bottom, right in self.blocks
+        )
+
+    def __iter__(self):
+        for top, left, bottom, right in self.blocks:
+            for row in range(top, bottom + 1):
+                for col in range(left, right + 1):
+                    yield row, col
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Slices are lists, as they were when selections were lists.
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for top, left, bottom, right in self.blocks:
+                width = right - left + 1
+                size = (bottom - top + 1) * width
+                if index < size:
+                    return top + index // width, left + index % width
+                index -= size
+        raise IndexError("CellRegion index out of range")
+
+    def __repr__(self):
+        return f"CellRegion({self.blocks!r})"
+
+    def Rows(self):
+        """
+        Iterates over every row touched by the region, in order.
+        """
+        return _merged((top, bottom) for top, left, bottom, right in self.blocks)
+
+    def Cols(self):
+        """
+        Iterates over every column touched by the region, in order.
+        """
+        return _merged((left, right) for top, left, bottom, right in self.blocks)
+
+    def Values(self, store):
+        """
+        Extracts the selected values from a ColumnStore.  Each block becomes a
+        list of column slices, so nothing is copied cell by cell.
+        """
+        return [
+            [store.columns[col][top : bottom + 1] for col in range(left, right + 1)]
+            for top, left, bottom, right in self.blocks
+        ]
+
+    def Cells(self):
+        """
+        Materializes the region as a list of (row, col) tuples.
+        """
+        return list(self)
@@ -0,0 +1,139 @@
+"""
+Column oriented storage for large tables.
+
+Each column is kept as a single sequence: a list, an array.array or, when
+NumPy is installed, an ndarray.  Columns handed to the store are adopted as
+they are rather than copied, so replacing or appending a whole dataset is a
+single operation per column.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _column(values):
+    if isinstance(values, (list, array)):
+        return values
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values
+    return list(values)
+
+
+def _extend(column, values):
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return numpy.concatenate((column, numpy.asarray(values, dtype=column.dtype)))
+    column.extend(values)
+    return column
+
+
+class ColumnStore(object):
+    """
+    Tabular data stored by column.  Data may be given either as a mapping of
+    column names to sequences or as a sequence of rows.
+    """
+
+    def __init__(self, names=(), data=None):
+        self.names = list(names)
+        self.columns = [[] for name in self.names]
+        self.rows = 0
+        # Bumped by every change to the data.
+        self.version = 0
+        if data is not None:
+            self.Replace(data)
+
+    def __len__(self):
+        return self.rows
+
+    def _split(self, data):
+        """
+        Returns the column names and columns for a batch of data.
+        """
+        if isinstance(data, ColumnStore):
+            return data.names, data.columns
+        if isinstance(data, Mapping):
+            return list(data.keys()), [_column(values) for values in data.values()]
+        columns = [list(values) for values in zip(*data)]
+        names = self.names
+        if len(names) != len(columns):
+            names = [str(col) for col in range(len(columns))]
+        return names, columns
+
+    def Replace(self, data):
+        """
+        Replaces the whole dataset in one call.
+        """
+        names, columns = self._split(data)
+        lengths = set(len(column) for column in columns)
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        self.names = list(names)
+        self.columns = list(columns)
+        self.rows = lengths.pop() if lengths else 0
+        self.version += 1
+
+    def Extend(self, data):
+        """
+        Appends a batch of rows (or columns of rows) to the dataset.
+        """
+        if not self.rows:
+            return self.Replace(data)
+        if isinstance(data, Mapping):
+            columns = [data[name] for name in self.names]
+        else:
+            names, columns = self._split(data)
+        if len(columns) != len(self.columns):
+            raise ValueError("Expected %d columns." % len(self.columns))
+        lengths = set(len(column) for column in columns)
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        self.columns = [
+            _extend(column, values) for column, values in zip(self.columns, columns)
+        ]
+        self.rows += lengths.pop() if lengths else 0
+        self.version += 1
+
+    def Index(self, col):
+        """
+        Returns the position of a column given either its name or position.
+        """
+        if isinstance(col, int):
+            return col
+        return self.names.index(col)
+
+    def GetColumn(self, col):
+        return self.columns[self.Index(col)]
+
+    def GetCell(self, row, col):
+        return self.columns[col][row]
+
+    def Convert(self, col, value):
+        """
+        Returns `value` (typically text typed into a cell) as the type column
+        `col` holds.  Raises ValueError or TypeError when it can't be.
+        """
+        column = self.columns[col]
+        if isinstance(column, array):
+            return float(value) if column.typecode in "fd" else int(value)
+        if numpy is not None and isinstance(column, numpy.ndarray):
+            return column.dtype.type(value)
+        return value
+
+    def SetCell(self, row, col, value):
+        self.columns[col][row] = self.Convert(col, value)
+        self.version += 1
+
+    def GetRow(self, row):
+        return tuple(column[row] for column in self.columns)
+
+    __getitem__ = GetRow
+
+    def ToDict(self):
+        """
+        Returns the columns keyed by name.  The columns are not copied.
+        """
+        return dict(zip(self.names, self.columns))
@@ -12,6 +12,10 @@ Created on Aug 23, 2012
 #  (c) Copyright 2006 by Enthought, Inc.
 #  License: BSD Style.
 # -------------------------------------------------------------------------------
+import heapq
+import time
+from itertools import count
+
 import wx
 
 
@@ -29,109 +33,241 @@ class FlowSizer(wx.PySizer):
         self._orient = orient
         self._frozen = False
         self._needed_size = None
+        self._invalidate()
+
+    def _invalidate(self):
+        """
+        Forgets the cached measurements and placements.
+        """
+        # Items and their (min size, expand, spacer) as of the last measure,
+        # sizes given as (along, across) the flow direction, and a cheap probe
+        # of each item's min size to tell when it has to be measured again.
+        self._items = []
+        self._mins = ()
+        self._probes = []
+        self._measured = False
+        # The size and measurements the current placements were flowed for,
+        # and the lines they were broken into as (first item, offset, width,
+        # running max, extent, visible).
+        self._key = None
+        self._lines = []
+        self._placements = []
+        self._overflow = None
+        # The absolute placements last applied to each item.
+        self._applied = []
+
+    def Add(self, *args, **kwargs):
+        self._invalidate()
+        return super(FlowSizer, self).Add(*args, **kwargs)
+
+    def Insert(self, *args, **kwargs):
+        self._invalidate()
+        return super(FlowSizer, self).Insert(*args, **kwargs)
+
+    def Prepend(self, *args, **kwargs):
+        self._invalidate()
+        return super(FlowSizer, self).Prepend(*args, **kwargs)
+
+    def Remove(self, *args, **kwargs):
+        self._invalidate()
+        return super(FlowSizer, self).Remove(*args, **kwargs)
+
+    def Detach(self, *args, **kwargs):
+        self._invalidate()
+        return super(FlowSizer, self).Detach(*args, **kwargs)
+
+    def Clear(self, *args, **kwargs):
+        self._invalidate()
+        return super(FlowSizer, self).Clear(*args, **kwargs)
+
+    def Invalidate(self):
+        """
+        Measures every item again on the next layout.  Items whose minimum
+        size changes (a label is changed, for instance) are noticed anyway,
+        this is only needed when something else about them changes.
+        """
+        self._invalidate()
+
+    def _probe(self, item):
+        """
+        A cheap stand-in for the item's min size.  Windows cache their best
+        size until something like SetLabel invalidates it, nested sizers are
+        measured the way the layout would measure them anyway.
+        """
+        if item.IsWindow():
+            return tuple(item.GetWindow().GetEffectiveMinSize())
+        if item.IsSizer():
+            return tuple(item.GetSizer().CalcMin())
+        return tuple(item.GetMinSize())
+
+    def _min(self, item, horizontal):
+        idx, idy = item.CalcMin()
+        size = (idx, idy) if horizontal else (idy, idx)
+        return size, bool(item.GetFlag() & wx.EXPAND), item.IsSpacer()
+
+    def _measure(self):
+        """
+        Measures every item, keeping the sizes along and across the flow
+        direction.  The measurements are reused until the items change.
+        """
+        horizontal = self._orient == wx.HORIZONTAL
+        self._items = list(self.GetChildren())
+        self._probes = [self._probe(item) for item in self._items]
+        self._mins = tuple(self._min(item, horizontal) for item in self._items)
+        self._lines = []
+        self._placements = []
+        self._measured = True
+
+    def _remeasure(self):
+        """
+        Measures again the items whose min size changed since they were last
+        measured, flowing them from scratch on the next layout if any did.
+        """
+        horizontal = self._orient == wx.HORIZONTAL
+        mins = None
+        for i, item in enumerate(self._items):
+            probe = self._probe(item)
+            if probe != self._probes[i]:
+                self._probes[i] = probe
+                if mins is None:
+                    mins = list(self._mins)
+                mins[i] = self._min(item, horizontal)
+        if mins is not None:
+            self._mins = tuple(mins)
+            self._lines = []
+            self._placements = []
 
     def CalcMin(self):
         """
         Calculates the minimum size needed by the sizer.
         """
+        if not self._measured:
+            self._measure()
+        else:
+            self._remeasure()
         if self._needed_size is not None:
             return self._needed_size
 
-        horizontal = self._orient == wx.HORIZONTAL
-        dx = dy = i = 0
+        across = max([size[1] for size, expand, spacer in self._mins] or [0])
+        if self._orient == wx.HORIZONTAL:
+            return wx.Size(0, across)
+        return wx.Size(across, 0)
 
-        while True:
-            try:
-                item = self.GetItem(i)
-                if item is None:
-                    break
-                i += 1
-            except:
-                break
-
-            idx, idy = item.CalcMin()
-            if horizontal:
-                dy = max(dy, idy)
-            else:
-                dx = max(dx, idx)
-
-        return wx.Size(dx, dy)
-
-    def RecalcSizes(self):
+    def _firstChangedLine(self, limit):
         """
-        Layout the contents of the sizer based on the sizer's current size
-        and position.
+        Returns the index of the first line of the last flow that breaks
+        differently at `limit`.
+        """
+        lines, mins = self._lines, self._mins
+        for k, (start, offset, width, curMax, extent, visible) in enumerate(lines):
+            end = lines[k + 1][0] if k + 1 < len(lines) else len(mins)
+            # Its items must still fit, and the next line's first item not.
+            if end - start > 1 and width > limit:
+                return k
+            if end < len(mins) and not (width > 0 and width + mins[end][0][0] > limit):
+                return k
+        return len(lines)
+
+    def _flow(self, dx, dy):
+        """
+        Breaks the measured items into lines for a sizer of the given size.
+        Returns each item's (x, y, width, height, visible) relative to the
+        sizer's position, and the size needed when the items don't all fit.
+        Lines before the first one whose break changes are kept from the
+        previous flow, only their visibility is updated.
         """
         horizontal = self._orient == wx.HORIZONTAL
-        x, y = self.GetPosition()
-        dx, dy = self.GetSize()
-        x0, y0 = x, y
-        ex = x + dx
-        ey = y + dy
-        mdx = mdy = sdx = sdy = i = 0
-
-        visible = True
-        cur_max = 0
-        while True:
-            try:
-                item = self.GetItem(i)
-                if item is None:
-                    break
-                i += 1
-            except:
-                break
-
-            idx, idy = item.CalcMin()
-            expand = item.GetFlag() & wx.EXPAND
-            if horizontal:
-                if (x > x0) and ((x + idx) > ex):
-                    x = x0
+        # Positions and sizes are worked out along the flow (limited by
+        # `limit`) and across it (limited by `depth`).
+        limit, depth = (dx, dy) if horizontal else (dy, dx)
+        mins, lines, placements = self._mins, self._lines, self._placements
+        if not mins:
+            return placements, None
+
+        changed = self._firstChangedLine(limit)
+        for k in range(changed):
+            start, offset, width, curMax, extent, visible = lines[k]
+            if visible != (k == 0 or offset < depth):
+                visible = not visible
+                lines[k] = (start, offset, width, curMax, extent, visible)
+                end = lines[k + 1][0] if k + 1 < len(lines) else len(mins)
+                for i in range(start, end):
+                    placements[i] = placements[i][:4] + (visible,)
+
+        if not lines:
+            # Nothing has been flowed yet, start from an empty first line.
+            lines.append((0, 0, 0, 0, 0, True))
+        if changed < len(lines):
+            start, y, _, cur_max, _, _ = lines[changed]
+            visible = changed == 0 or y < depth
+            del lines[changed:]
+            del placements[start:]
+            x = mdy = sdy = 0
+            lineStart, lineCurMax = start, cur_max
+            for i in range(start, len(mins)):
+                (idx, idy), expand, spacer = mins[i]
+                if (x > 0) and ((x + idx) > limit):
+                    lines.append((lineStart, y, x, lineCurMax, mdy + sdy, visible))
+                    lineStart, lineCurMax = i, cur_max
+                    x = 0
                     y += mdy + sdy
                     mdy = sdy = 0
-                    if y >= ey:
+                    if y >= depth:
                         visible = False
 
                 cur_max = max(idy, cur_max)
                 if expand:
                     idy = cur_max
 
-                if item.IsSpacer():
+                if spacer:
                     sdy = max(sdy, idy)
-                    if x == x0:
+                    if x == 0:
                         idx = 0
-                item.SetDimension(wx.Point(x, y), wx.Size(idx, idy))
-                item.Show(visible)
+                if horizontal:
+                    placements.append((x, y, idx, idy, visible))
+                else:
+                    placements.append((y, x, idy, idx, visible))
                 x += idx
                 mdy = max(mdy, idy)
-            else:
-                if (y > y0) and ((y + idy) > ey):
-                    y = y0
-                    x += mdx + sdx
-                    mdx = sdx = 0
-                    if x >= ex:
-                        visible = False
+            lines.append((lineStart, y, x, lineCurMax, mdy + sdy, visible))
 
-                cur_max = max(idx, cur_max)
-                if expand:
-                    idx = cur_max
-
-                if item.IsSpacer():
-                    sdx = max(sdx, idx)
-                    if y == y0:
-                        idy = 0
-
-                item.SetDimension(wx.Point(x, y), wx.Size(idx, idy))
-                item.Show(visible)
-                y += idy
-                mdx = max(mdx, idx)
-
-        if (not visible) and (self._needed_size is None):
-            max_dx = max_dy = 0
-            if horizontal:
-                max_dy = max(dy, y + mdy + sdy - y0)
-            else:
-                max_dx = max(dx, x + mdx + sdx - x0)
-            self._needed_size = wx.Size(max_dx, max_dy)
+        start, offset, width, curMax, extent, visible = lines[-1]
+        overflow = None
+        if not visible:
+            needed = max(depth, offset + extent)
+            overflow = wx.Size(0, needed) if horizontal else wx.Size(needed, 0)
+        return placements, overflow
+
+    def RecalcSizes(self):
+        """
+        Layout the contents of the sizer based on the sizer's current size
+        and position.  Line breaks are only recomputed from the first line
+        that changes, and only items whose placement moved are touched.
+        """
+        if not self._measured:
+            self._measure()
+        x0, y0 = self.GetPosition()
+        dx, dy = self.GetSize()
+
+        key = (dx, dy, self._mins)
+        if key != self._key:
+            self._key = key
+            self._placements, self._overflow = self._flow(dx, dy)
+
+        applied = self._applied
+        self._applied = []
+        for i, (item, (x, y, idx, idy, visible)) in enumerate(
+            zip(self._items, self._placements)
+        ):
+            placement = (x0 + x, y0 + y, idx, idy, visible)
+            self._applied.append(placement)
+            if i < len(applied) and applied[i] == placement:
+                continue
+            item.SetDimension(wx.Point(x0 + x, y0 + y), wx.Size(idx, idy))
+            item.Show(visible)
+
+        if (self._overflow is not None) and (self._needed_size is None):
+            self._needed_size = self._overflow
             if not self._frozen:
                 self._do_parent("_freeze")
             do_later(self._do_parent, "_thaw")
@@ -159,16 +295,7 @@ class FlowSizer(wx.PySizer):
         """
         Does a specified operation on the sizer's parent window.
         """
-        i = 0
-        while True:
-            try:
-                item = self.GetItem(i)
-                if item is None:
-                    break
-                i += 1
-            except:
-                return
-
+        for item in self.GetChildren():
             if item.IsWindow():
                 getattr(self, method)(item.GetWindow().GetParent())
                 return
@@ -180,55 +307,120 @@ class FlowSizer(wx.PySizer):
 #  (c) Copyright 2005 by Enthought, Inc.
 #  License: BSD Style.
 # -------------------------------------------------------------------------------
-class DoLaterTimer(wx.Timer):
+class DeferredCalls(wx.Timer):
     """
-    Provides a simple function for scheduling some code to run at some time in
-    the future.
+    Schedules calls to run some time in the future from a single timer.
+    Pending calls are keyed by their (callable, args, kw_args) signature, so
+    scheduling a call that is already pending just moves it to the new time.
+    `coalesced` counts how many calls were folded into a pending one.
     """
 
-    # List of currently active timers:
-    active_timers = []
-
-    def __init__(self, interval, callable, args, kw_args):  # @ReservedAssignment
+    def __init__(self):
         """
         Initializes the object:
         """
-        global active_timers
         wx.Timer.__init__(self)
-        for timer in self.active_timers:
-            if (
-                (timer.callable == callable)
-                and (timer.args == args)
-                and (timer.kw_args == kw_args)
-            ):
-                timer.Start(interval, True)
-                return
-        self.active_timers.append(self)
-        self.callable = callable
-        self.args = args
-        self.kw_args = kw_args
-        self.Start(interval, True)
+        # Signature -> (due, callable, args, kw_args) for every pending call.
+        self.pending = {}
+        # (due, sequence, signature) entries, some of them stale.
+        self.queue = []
+        self.sequence = count()
+        self.scheduled = 0
+        self.coalesced = 0
+
+    def _signature(self, callable, args, kw_args):  # @ReservedAssignment
+        try:
+            key = (callable, args, frozenset(kw_args.items()))
+            hash(key)
+            return key
+        except TypeError:
+            # Unhashable arguments fall back to comparing with pending calls.
+            for key, (due, c, a, k) in self.pending.items():
+                if isinstance(key, int) and (c, a, k) == (callable, args, kw_args):
+                    return key
+            return next(self.sequence)
+
+    def schedule(self, interval, callable, args, kw_args):  # @ReservedAssignment
+        """
+        Runs callable(*args, **kw_args) `interval` milliseconds from now.
+        """
+        key = self._signature(callable, args, kw_args)
+        due = time.monotonic() + interval / 1000.0
+        self.scheduled += 1
+        if key in self.pending:
+            self.coalesced += 1
+        self.pending[key] = (due, callable, args, kw_args)
+        heapq.heappush(self.queue, (due, next(self.sequence), key))
+        if self.queue[0][2] is key or not self.IsRunning():
+            self._restart()
+
+    def _restart(self):
+        queue, pending = self.queue, self.pending
+        # Drop entries for calls that were moved or have already run.
+        while queue and pending.get(queue[0][2], (None,))[0] != queue[0][0]:
+            heapq.heappop(queue)
+        if not queue:
+            self.Stop()
+            return
+        delay = max(0, int((queue[0][0] - time.monotonic()) * 1000))
+        self.Start(delay, True)
 
     def Notify(self):
         """
         Handles the timer pop event:
         """
+        now = time.monotonic()
+        queue, pending = self.queue, self.pending
+        try:
+            while queue and queue[0][0] <= now:
+                due, sequence, key = heapq.heappop(queue)
+                entry = pending.get(key)
+                if entry is None or entry[0] != due:
+                    continue
+                del pending[key]
+                due, callable, args, kw_args = entry  # @ReservedAssignment
+                callable(*args, **kw_args)
+        finally:
+            self._restart()
+
+    def stats(self):
+        return dict(
+            scheduled=self.scheduled,
+            coalesced=self.coalesced,
+            pending=len(self.pending),
+        )
+
+
+_scheduler = None
+
+
+def scheduler():
+    """
+    Returns the shared DeferredCalls instance, creating it on first use.
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = DeferredCalls()
+    return _scheduler
 
-        global active_timers
 
-        self.active_timers.remove(self)
-        self.callable(*self.args, **self.kw_args)
+def DoLaterTimer(interval, callable, args, kw_args):  # @ReservedAssignment
+    """
+    Kept for backwards compatibility, schedules through the shared
+    DeferredCalls instead of creating a timer per call.
+    """
+    scheduler().schedule(interval, callable, args, kw_args)
 
 
 def do_later(callable, *args, **kw_args):  # @ReservedAssignment
     """
     Does something 50 milliseconds from now.
     """
-    DoLaterTimer(50, callable, args, kw_args)
+    scheduler().schedule(50, callable, args, kw_args)
 
 
 def do_after(interval, callable, *args, **kw_args):  # @ReservedAssignment
     """
     Does something after some specified time interval.
     """
-    DoLaterTimer(interval, callable, args, kw_args)
+    scheduler().schedule(interval, callable, args, kw_args)
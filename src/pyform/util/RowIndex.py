@@ -0,0 +1,112 @@
+"""
+Sort and filter indexes over a sequence of rows.
+
+Rows are never moved or copied.  Sorting and filtering only compute a
+permutation of row positions (the view), which list controls then read
+through.  Sort permutations are cached per column, and each row's filter
+text is lowered and joined once.
+"""
+
+from numbers import Real
+
+
+def _sortKey(value):
+    # Numbers (NumPy scalars too) sort numerically, everything else by its
+    # text.  Complex numbers can't be ordered, so they count as text.
+    if isinstance(value, Real) and not isinstance(value, bool):
+        return (0, value, "")
+    return (1, 0, "" if value is None else str(value).lower())
+
+
+class RowIndex(object):
+    """
+    A view over `rows`, any object with __len__ and __getitem__ returning a
+    row (a sequence of column values).  `view` holds the positions of the
+    visible rows in display order.
+    """
+
+    def __init__(self, rows=()):
+        self.SetRows(rows)
+
+    def SetRows(self, rows):
+        self.rows = rows
+        self.column = None
+        self.ascending = True
+        self.text = ""
+        self._sorted = {}
+        self._lowered = None
+        self._mask = None
+        self.view = range(len(rows))
+
+    def __len__(self):
+        return len(self.view)
+
+    def GetRow(self, item):
+        """
+        Returns the row displayed at position `item` of the view.
+        """
+        return self.rows[self.view[item]]
+
+    def GetRowIndex(self, item):
+        return self.view[item]
+
+    def GetItem(self, row):
+        """
+        Returns the position of `row` in the view, or None when it's filtered
+        out.
+        """
+        try:
+            return self.view.index(row)
+        except ValueError:
+            return None
+
+    def _order(self):
+        if self.column is None:
+            order = range(len(self.rows))
+        else:
+            if self.column not in self._sorted:
+                rows, col = self.rows, self.column
+                self._sorted[col] = sorted(
+                    range(len(rows)), key=lambda i: _sortKey(rows[i][col])
+                )
+            order = self._sorted[self.column]
+        return order if self.ascending else order[::-1]
+
+    def _lower(self):
+        if self._lowered is None:
+            self._lowered = [
+                "\t".join(map(str, row)).lower()
+                for row in (self.rows[i] for i in range(len(self.rows)))
+            ]
+        return self._lowered
+
+    def Sort(self, column, ascending=True):
+        """
+        Orders the view by a column, keeping the current filter.
+        """
+        self.column, self.ascending = column, ascending
+        order = self._order()
+        if self._mask is None:
+            self.view = order
+        else:
+            mask = self._mask
+            self.view = [i for i in order if mask[i]]
+
+    def Filter(self, text):
+        """
+        Limits the view to rows containing `text`, ignoring case.  Narrowing
+        an existing filter only rechecks the rows that currently match.
+        """
+        text = text.lower()
+        if not text:
+            self.text, self._mask = "", None
+            self.view = self._order()
+            return
+        lowered = self._lower()
+        narrowing = self._mask is not None and self.text in text
+        candidates = self.view if narrowing else self._order()
+        self.view = [i for i in candidates if text in lowered[i]]
+        self._mask = bytearray(len(self.rows))
+        for i in self.view:
+            self._mask[i] = 1
+        self.text = text
@@ -0,0 +1,79 @@
+"""
+Type-ahead lookup over very large lists of strings.
+
+Options are lowered once, sorted for prefix lookups with bisect, and joined
+into one newline separated string for substring lookups with str.find.  Both
+stop as soon as enough matches are found, so a search costs about the same
+whether there are a thousand options or a million.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class TextIndex(object):
+    """
+    Finds the options that start with, or else contain, a piece of text.
+    The index is built on first use, or ahead of time through `Build` (which
+    is safe to call from a worker thread).
+    """
+
+    def __init__(self, options=()):
+        self.options = list(options)
+        self._lock = threading.Lock()
+        self._keys = None
+
+    def __len__(self):
+        return len(self.options)
+
+    def IsBuilt(self):
+        return self._keys is not None
+
+    def Build(self):
+        with self._lock:
+            if self._keys is not None:
+                return
+            lowered = [
+                str(option).replace("\n", " ").lower() for option in self.options
+            ]
+            order = sorted(range(len(lowered)), key=lowered.__getitem__)
+            starts, offset = array("l"), 0
+            for key in lowered:
+                starts.append(offset)
+                offset += len(key) + 1
+            self._order = order
+            self._blob = "\n".join(lowered)
+            self._starts = starts
+            self._keys = [lowered[i] for i in order]
+
+    def Search(self, text, limit=50):
+        """
+        Returns up to `limit` options matching `text`, ignoring case.  Options
+        starting with the text come first, in sorted order, followed by the
+        options containing it, in their original order.
+        """
+        text = text.lower()
+        if not text:
+            return self.options[:limit]
+        if self._keys is None:
+            self.Build()
+        keys, order, found = self._keys, self._order, []
+        seen = set()
+        pos = bisect_left(keys, text)
+        while pos < len(keys) and len(found) < limit and keys[pos].startswith(text):
+            seen.add(order[pos])
+            found.append(order[pos])
+            pos += 1
+        blob, starts, pos = self._blob, self._starts, 0
+        while len(found) < limit and "\n" not in text:
+            pos = blob.find(text, pos)
+            if pos < 0:
+                break
+            idx = bisect_right(starts, pos) - 1
+            if idx not in seen:
+                seen.add(idx)
+                found.append(idx)
+            # Continue from the start of the next option.
+            pos = starts[idx + 1] if idx + 1 < len(starts) else len(blob)
+        return [self.options[idx] for idx in found]
@@ -0,0 +1,35 @@
+"""
+A shared pool of worker threads for work that shouldn't block the UI.
+
+Results always come back to the UI thread through wx.CallAfter, so callbacks
+are free to touch widgets.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import wx
+
+_executor = None
+_lock = threading.Lock()
+
+
+def executor():
+    """
+    Returns the shared ThreadPoolExecutor, creating it on first use.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pyform")
+    return _executor
+
+
+def run_in_background(callable, callback, *args, **kw_args):  # @ReservedAssignment
+    """
+    Runs `callable` on a worker thread and then calls `callback` with the
+    finished Future on the UI thread.
+    """
+    future = executor().submit(callable, *args, **kw_args)
+    future.add_done_callback(lambda future: wx.CallAfter(callback, future))
+    return future
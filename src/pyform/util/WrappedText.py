@@ -0,0 +1,106 @@
+"""
+A word wrapped paragraph of text drawn in a single window.
+
+Word widths are measured once per font and shared between every instance,
+so re-wrapping after a resize is plain arithmetic.  The most recently used
+extents are kept, up to `WrappedText.extentLimit` of them.
+"""
+
+from collections import OrderedDict
+
+import wx
+
+from .FlowSizer import do_later
+
+
+class WrappedText(wx.Window):
+    """
+    Draws `label` word wrapped to the width of the window.  Words are spaced
+    the way FlowSizer spaces StaticTexts added with a TOP | RIGHT border of
+    `gap`.  The minimum height follows the wrapped text.
+    """
+
+    # Word extents keyed by (font description, word), least recently used
+    # first.
+    _extents = OrderedDict()
+    extentLimit = 20000
+
+    def __init__(self, parent, label="", gap=2, **kwargs):
+        kwargs["style"] = kwargs.get("style", 0) | wx.FULL_REPAINT_ON_RESIZE
+        wx.Window.__init__(self, parent, **kwargs)
+        self.gap = gap
+        self._width = None
+        self._placements = []
+        self.Bind(wx.EVT_PAINT, self.onPaint)
+        self.Bind(wx.EVT_SIZE, self.onSize)
+        self.SetLabel(label)
+
+    def SetLabel(self, label):
+        self.words = label.split()
+        self._width = None
+        self._measure()
+        self._wrap(self.GetSize()[0] or sum(w for w, h in self._sizes))
+
+    def GetLabel(self):
+        return " ".join(self.words)
+
+    def SetFont(self, font):
+        result = super(WrappedText, self).SetFont(font)
+        self.SetLabel(self.GetLabel())
+        return result
+
+    def _measure(self):
+        """
+        Looks up each word's extent, measuring only words not seen before in
+        this font.
+        """
+        font = self.GetFont().GetNativeFontInfoDesc()
+        extents, sizes = WrappedText._extents, []
+        for word in self.words:
+            key = (font, word)
+            size = extents.get(key)
+            if size is None:
+                size = extents[key] = tuple(self.GetTextExtent(word))
+            else:
+                extents.move_to_end(key)
+            sizes.append(size)
+        while len(extents) > self.extentLimit:
+            extents.popitem(last=False)
+        self._sizes = sizes
+        self._lineHeight = max([h for w, h in self._sizes] or [self.GetCharHeight()])
+
+    def _wrap(self, width):
+        """
+        Breaks the words into lines for `width` and updates the min size.
+        """
+        if width == self._width:
+            return
+        self._width = width
+        gap, line = self.gap, self._lineHeight + self.gap
+        x, y, placements = 0, gap, []
+        for w, h in self._sizes:
+            if x > 0 and x + w + gap > width:
+                x, y = 0, y + line
+            placements.append((x, y))
+            x += w + gap
+        self._placements = placements
+        widest = max([w for w, h in self._sizes] or [0]) + gap
+        height = y + self._lineHeight if placements else 0
+        if tuple(self.GetMinSize()) != (widest, height):
+            self.SetMinSize((widest, height))
+            if self.GetParent():
+                do_later(self.GetParent().Layout)
+
+    def DoGetBestSize(self):
+        return self.GetMinSize()
+
+    def onSize(self, evt):
+        evt.Skip()
+        self._wrap(evt.GetSize()[0])
+
+    def onPaint(self, evt):
+        dc = wx.PaintDC(self)
+        dc.SetFont(self.GetFont())
+        dc.SetTextForeground(self.GetForegroundColour())
+        for word, (x, y) in zip(self.words, self._placements):
+            dc.DrawText(word, x, y)